@@ -1,8 +1,153 @@
+import io
+import json
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
 import pandas as pd
-from utils.database import get_database_connection
+from sqlalchemy import text
+from utils.database import get_database_connection, quote_identifier
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Table names, column counts and estimated rows in one round-trip
+TABLES_INFO_QUERY = """
+SELECT t.table_name,
+       COUNT(c.column_name) AS column_count,
+       s.n_live_tup AS approx_rows
+FROM information_schema.tables t
+LEFT JOIN information_schema.columns c
+       ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+LEFT JOIN pg_stat_user_tables s
+       ON s.schemaname = t.table_schema AND s.relname = t.table_name
+WHERE t.table_schema = 'public'
+AND t.table_type = 'BASE TABLE'
+GROUP BY t.table_name, s.n_live_tup
+ORDER BY t.table_name;
+"""
+
+COLUMNS_QUERY = """
+SELECT column_name, data_type, is_nullable, column_default
+FROM information_schema.columns
+WHERE table_schema = 'public' AND table_name = :table_name
+ORDER BY ordinal_position;
+"""
+
+PRIMARY_KEY_QUERY = """
+SELECT kcu.column_name
+FROM information_schema.table_constraints tc
+JOIN information_schema.key_column_usage kcu
+     ON kcu.constraint_name = tc.constraint_name AND kcu.table_schema = tc.table_schema
+WHERE tc.table_schema = 'public'
+AND tc.table_name = :table_name
+AND tc.constraint_type = 'PRIMARY KEY'
+ORDER BY kcu.ordinal_position;
+"""
+
+# Custom Query templates, filled in with the selected table
+SAMPLE_QUERIES = {
+    "SELECT (Read)": "SELECT * FROM {table} LIMIT 10;",
+    "INSERT (Create)": "-- INSERT INTO {table} (column1, column2) VALUES ('value1', 'value2');",
+    "UPDATE (Modify)": "-- UPDATE {table} SET column1 = 'new_value' WHERE id = 1;",
+    "DELETE (Remove)": "-- DELETE FROM {table} WHERE id = 1;"
+}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_tables_info():
+    """Cached catalog summary as (table_name, column_count, approx_rows) tuples"""
+    with get_database_connection() as db:
+        rows = db.session.execute(text(TABLES_INFO_QUERY)).fetchall()
+    
+    # Tables without statistics (e.g. never analyzed) are reported instead of silently counted as empty
+    missing = [table_name for table_name, _, approx_rows in rows if approx_rows is None]
+    if missing:
+        logger.warning("No row statistics for tables: %s", ", ".join(missing))
+    return [(table_name, column_count, approx_rows or 0) for table_name, column_count, approx_rows in rows]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_columns(table_name):
+    """Cached column definitions for a table"""
+    with get_database_connection() as db:
+        result = db.session.execute(text(COLUMNS_QUERY), {'table_name': table_name})
+        return [tuple(row) for row in result.fetchall()]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_count(table_name):
+    """Cached exact row count for a table"""
+    with get_database_connection() as db:
+        return db.session.execute(text(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")).scalar()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_primary_key(table_name):
+    """Cached single-column primary key of a table, or None"""
+    with get_database_connection() as db:
+        result = db.session.execute(text(PRIMARY_KEY_QUERY), {'table_name': table_name})
+        columns = [row[0] for row in result.fetchall()]
+    return columns[0] if len(columns) == 1 else None
+
+def _clear_metadata_cache():
+    """Invalidate cached catalog data after the database changes"""
+    _fetch_tables_info.clear()
+    _fetch_columns.clear()
+    _fetch_count.clear()
+    _fetch_primary_key.clear()
+
+# Server-side defaults the Add Record form leaves to the database
+SERVER_DEFAULT_MARKERS = ('nextval(', 'CURRENT_TIMESTAMP', 'now()')
+
+def _form_columns(columns_data):
+    """Columns the Add Record form should ask for, skipping serial ids and audit timestamps
+
+    Each entry is (name, data_type, nullable, has_default).
+    """
+    return [
+        (name, data_type, is_nullable == 'YES', default is not None)
+        for name, data_type, is_nullable, default in columns_data
+        if not (default and any(marker in default for marker in SERVER_DEFAULT_MARKERS))
+    ]
+
+def _column_input(name, data_type, optional):
+    """Render the Streamlit widget matching a PostgreSQL column type (optional inputs start blank)"""
+    label = name.replace('_', ' ').title()
+    if data_type in ('integer', 'bigint', 'smallint'):
+        return st.number_input(label, value=None if optional else 0, step=1)
+    if data_type in ('numeric', 'real', 'double precision'):
+        return st.number_input(label, value=None if optional else 0.0, format="%.2f")
+    if data_type == 'boolean':
+        if optional:
+            return st.selectbox(label, [True, False], index=None)
+        return st.checkbox(label)
+    if data_type == 'date' or data_type.startswith('timestamp'):
+        return st.date_input(label, value=None if optional else datetime.now())
+    if data_type == 'text':
+        return st.text_area(label)
+    return st.text_input(label)
+
+def _insert_statement(table_name, column_names):
+    """INSERT ... RETURNING for a table; SQLAlchemy caches the compiled form per SQL string"""
+    return text(
+        f"INSERT INTO {quote_identifier(table_name)} "
+        + (
+            f"({', '.join(quote_identifier(name) for name in column_names)}) "
+            f"VALUES ({', '.join(f':{name}' for name in column_names)}) "
+            if column_names else "DEFAULT VALUES "
+        )
+        + "RETURNING *"
+    )
+
+def _add_record(db, table_name, values):
+    """Insert one record and return the new row"""
+    try:
+        row = db.session.execute(_insert_statement(table_name, list(values)), values).mappings().one()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    _clear_metadata_cache()
+    return row
+
+@st.fragment
 def show_database_admin():
     """Database administration interface"""
     
@@ -12,34 +157,17 @@ def show_database_admin():
     st.subheader("Database Overview")
     
     with get_database_connection() as db:
-        # Get table information
-        tables_query = """
-        SELECT table_name, 
-               (SELECT COUNT(*) FROM information_schema.columns WHERE table_name = t.table_name) as column_count
-        FROM information_schema.tables t
-        WHERE table_schema = 'public' 
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name;
-        """
-        
         try:
-            result = db.session.execute(db.engine.text(tables_query))
-            tables_info = result.fetchall()
+            tables_info = _fetch_tables_info()
             
             # Display table summary
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("Total Tables", len(tables_info))
             with col2:
-                # Get total records across all tables
-                total_records = 0
-                for table_name, _ in tables_info:
-                    try:
-                        count_result = db.session.execute(db.engine.text(f"SELECT COUNT(*) FROM {table_name}"))
-                        total_records += count_result.scalar()
-                    except:
-                        pass
-                st.metric("Total Records", total_records)
+                # Estimated total records across all tables (from table statistics)
+                total_records = sum(approx_rows for _, _, approx_rows in tables_info)
+                st.metric("Total Records", f"~{total_records:,}")
             with col3:
                 st.metric("Database Status", "✅ Connected")
             
@@ -50,67 +178,98 @@ def show_database_admin():
             
             # Table selector
             table_names = [table[0] for table in tables_info]
+            table_rows = {table[0]: table[2] for table in tables_info}
             selected_table = st.selectbox("Select table to view/manage:", table_names)
             
             if selected_table:
-                # Table details tabs
-                tab1, tab2, tab3, tab4 = st.tabs(["View Data", "Table Info", "Add Record", "Custom Query"])
+                if selected_table not in table_rows:
+                    raise ValueError(f"Unknown table: {selected_table}")
+                
+                approx_rows = table_rows[selected_table]
+                
+                # Only the active view is built, so its catalog queries run on demand
+                active_tab = st.radio(
+                    "View:",
+                    ["View Data", "Table Info", "Add Record", "Custom Query"],
+                    horizontal=True,
+                    key="admin_active_tab",
+                    label_visibility="collapsed"
+                )
                 
-                with tab1:
+                if active_tab == "View Data":
                     # Display table data
                     st.markdown(f"#### Data from `{selected_table}`")
                     
                     # Pagination controls
+                    pk_column = _fetch_primary_key(selected_table)
                     col1, col2, col3 = st.columns([1, 1, 2])
                     with col1:
                         page_size = st.selectbox("Records per page:", [10, 25, 50, 100], index=1)
-                    with col2:
-                        # Get total count
-                        count_result = db.session.execute(db.engine.text(f"SELECT COUNT(*) FROM {selected_table}"))
-                        total_count = count_result.scalar()
-                        total_pages = (total_count + page_size - 1) // page_size
-                        page_num = st.number_input("Page:", min_value=1, max_value=max(1, total_pages), value=1)
-                    with col3:
-                        st.write(f"Total records: {total_count}")
                     
-                    # Load and display data
-                    offset = (page_num - 1) * page_size
-                    data_df = db.get_table_data(selected_table, limit=f"{page_size} OFFSET {offset}")
+                    if pk_column:
+                        # Keyset pagination: remember the last key of every page already visited
+                        page_keys = st.session_state.setdefault(f"admin_page_keys_{selected_table}_{page_size}", [])
+                        with col2:
+                            st.write(f"Page {len(page_keys) + 1}")
+                        with col3:
+                            st.write(f"Total records: ~{approx_rows:,}")
+                        
+                        last_seen_pk = page_keys[-1] if page_keys else None
+                        data_df = db.get_table_page(selected_table, pk_column, last_seen_pk, page_size)
+                    else:
+                        # Tables without a single-column primary key fall back to OFFSET paging
+                        with col2:
+                            total_count = _fetch_count(selected_table)
+                            total_pages = (total_count + page_size - 1) // page_size
+                            page_num = st.number_input("Page:", min_value=1, max_value=max(1, total_pages), value=1)
+                        with col3:
+                            st.write(f"Total records: {total_count}")
+                        
+                        offset = (page_num - 1) * page_size
+                        data_df = db.get_table_data(selected_table, limit=page_size, offset=offset)
                     
                     if not data_df.empty:
                         st.dataframe(data_df, use_container_width=True)
                         
+                        if pk_column:
+                            nav1, nav2 = st.columns(2)
+                            with nav1:
+                                if st.button("⬅️ Previous", disabled=not page_keys):
+                                    page_keys.pop()
+                                    st.rerun(scope="fragment")
+                            with nav2:
+                                if st.button("Next ➡️", disabled=len(data_df) < page_size):
+                                    page_keys.append(data_df[pk_column].tolist()[-1])
+                                    st.rerun(scope="fragment")
+                        
                         # Export options
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.button("📥 Export to CSV"):
-                                csv = data_df.to_csv(index=False)
+                                # Export the whole table via COPY, not just the visible page
                                 st.download_button(
                                     label="Download CSV",
-                                    data=csv,
+                                    data=db.export_table_csv(selected_table),
                                     file_name=f"{selected_table}_export.csv",
                                     mime="text/csv"
                                 )
                         with col2:
                             if st.button("🔄 Refresh Data"):
-                                st.rerun()
+                                _clear_metadata_cache()
+                                st.rerun(scope="fragment")
+                    elif pk_column and page_keys:
+                        st.info("No more records.")
+                        if st.button("⬅️ Previous"):
+                            page_keys.pop()
+                            st.rerun(scope="fragment")
                     else:
                         st.info(f"No data found in {selected_table}")
                 
-                with tab2:
+                elif active_tab == "Table Info":
                     # Table structure information
                     st.markdown(f"#### Structure of `{selected_table}`")
                     
-                    # Get column information
-                    columns_query = f"""
-                    SELECT column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns 
-                    WHERE table_name = '{selected_table}'
-                    ORDER BY ordinal_position;
-                    """
-                    
-                    columns_result = db.session.execute(db.engine.text(columns_query))
-                    columns_data = columns_result.fetchall()
+                    columns_data = _fetch_columns(selected_table)
                     
                     if columns_data:
                         columns_df = pd.DataFrame(columns_data, columns=['Column', 'Type', 'Nullable', 'Default'])
@@ -122,116 +281,50 @@ def show_database_admin():
                     with col1:
                         st.metric("Total Columns", len(columns_data))
                     with col2:
-                        st.metric("Total Rows", total_count)
+                        st.metric("Total Rows", f"~{approx_rows:,}")
                 
-                with tab3:
+                elif active_tab == "Add Record":
                     # Add new record form
                     st.markdown(f"#### Add New Record to `{selected_table}`")
                     
-                    # Dynamic form based on table structure
-                    if selected_table == "customers":
-                        with st.form("add_customer"):
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                customer_id = st.text_input("Customer ID")
-                                name = st.text_input("Name")
-                                email = st.text_input("Email")
-                                phone = st.text_input("Phone")
-                            with col2:
-                                company = st.text_input("Company")
-                                industry = st.selectbox("Industry", ["Technology", "Finance", "Healthcare", "Education", "Retail", "Manufacturing", "Other"])
-                                status = st.selectbox("Status", ["Active", "Prospect", "Inactive"])
-                                source = st.selectbox("Source", ["Website", "Referral", "Cold Call", "Social Media", "Event"])
-                            
-                            notes = st.text_area("Notes")
-                            
-                            if st.form_submit_button("Add Customer"):
-                                insert_query = """
-                                INSERT INTO customers (customer_id, name, email, phone, company, industry, status, source, notes)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                """
-                                try:
-                                    db.execute_query(insert_query, (customer_id, name, email, phone, company, industry, status, source, notes))
-                                    st.success("Customer added successfully!")
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"Error adding customer: {e}")
+                    columns_data = _fetch_columns(selected_table)
                     
-                    elif selected_table == "inventory":
-                        with st.form("add_inventory"):
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                sku = st.text_input("SKU")
-                                product_name = st.text_input("Product Name")
-                                category = st.text_input("Category")
-                                current_stock = st.number_input("Current Stock", min_value=0, value=0)
-                            with col2:
-                                reorder_point = st.number_input("Reorder Point", min_value=0, value=10)
-                                unit_cost = st.number_input("Unit Cost", min_value=0.0, value=0.0, format="%.2f")
-                                unit_price = st.number_input("Unit Price", min_value=0.0, value=0.0, format="%.2f")
-                                supplier = st.text_input("Supplier")
-                            
-                            location = st.text_input("Location")
-                            
-                            if st.form_submit_button("Add Inventory Item"):
-                                insert_query = """
-                                INSERT INTO inventory (sku, product_name, category, current_stock, reorder_point, unit_cost, unit_price, supplier, location)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                """
-                                try:
-                                    db.execute_query(insert_query, (sku, product_name, category, current_stock, reorder_point, unit_cost, unit_price, supplier, location))
-                                    st.success("Inventory item added successfully!")
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"Error adding inventory item: {e}")
+                    # Form generated from the table's column metadata
+                    form_columns = _form_columns(columns_data)
                     
-                    elif selected_table == "employees":
-                        with st.form("add_employee"):
+                    if form_columns:
+                        with st.form(f"add_{selected_table}"):
+                            values = {}
                             col1, col2 = st.columns(2)
-                            with col1:
-                                employee_id = st.text_input("Employee ID")
-                                first_name = st.text_input("First Name")
-                                last_name = st.text_input("Last Name")
-                                email = st.text_input("Email")
-                            with col2:
-                                phone = st.text_input("Phone")
-                                department = st.text_input("Department")
-                                position = st.text_input("Position")
-                                salary = st.number_input("Salary", min_value=0.0, value=50000.0, format="%.2f")
-                            
-                            hire_date = st.date_input("Hire Date", datetime.now())
+                            for i, (name, data_type, nullable, has_default) in enumerate(form_columns):
+                                with col1 if i % 2 == 0 else col2:
+                                    value = _column_input(name, data_type, nullable or has_default)
+                                if value is None or value == "":
+                                    if has_default:
+                                        continue  # Left out of the INSERT so the server default applies
+                                    if nullable:
+                                        value = None  # Blank optional fields are stored as NULL
+                                values[name] = value
                             
-                            if st.form_submit_button("Add Employee"):
-                                insert_query = """
-                                INSERT INTO employees (employee_id, first_name, last_name, email, phone, department, position, hire_date, salary)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                """
+                            if st.form_submit_button("Add Record"):
                                 try:
-                                    db.execute_query(insert_query, (employee_id, first_name, last_name, email, phone, department, position, hire_date, salary))
-                                    st.success("Employee added successfully!")
-                                    st.rerun()
+                                    row = _add_record(db, selected_table, values)
+                                    st.success(f"Record added successfully (ID {row.get('id', '-')})")
+                                    st.rerun(scope="fragment")
                                 except Exception as e:
-                                    st.error(f"Error adding employee: {e}")
-                    
+                                    st.error(f"Error adding record: {e}")
                     else:
-                        st.info(f"Custom form for {selected_table} not implemented. Use the Custom Query tab to insert data.")
+                        st.info(f"No editable columns found for {selected_table}.")
                 
-                with tab4:
+                elif active_tab == "Custom Query":
                     # Custom SQL query interface
                     st.markdown("#### Custom SQL Query")
                     st.warning("⚠️ Be careful with SQL queries. Always test with SELECT statements first.")
                     
                     query_type = st.selectbox("Query Type:", ["SELECT (Read)", "INSERT (Create)", "UPDATE (Modify)", "DELETE (Remove)"])
                     
-                    # Sample queries
-                    sample_queries = {
-                        "SELECT (Read)": f"SELECT * FROM {selected_table} LIMIT 10;",
-                        "INSERT (Create)": f"-- INSERT INTO {selected_table} (column1, column2) VALUES ('value1', 'value2');",
-                        "UPDATE (Modify)": f"-- UPDATE {selected_table} SET column1 = 'new_value' WHERE id = 1;",
-                        "DELETE (Remove)": f"-- DELETE FROM {selected_table} WHERE id = 1;"
-                    }
-                    
-                    custom_query = st.text_area("SQL Query:", value=sample_queries[query_type], height=100)
+                    sample_query = SAMPLE_QUERIES[query_type].format(table=selected_table)
+                    custom_query = st.text_area("SQL Query:", value=sample_query, height=100)
                     
                     col1, col2 = st.columns(2)
                     with col1:
@@ -254,6 +347,7 @@ def show_database_admin():
                                             st.info("Query executed successfully.")
                                     else:
                                         st.success("Query executed successfully!")
+                                        _clear_metadata_cache()
                                         if query_type in ["INSERT (Create)", "UPDATE (Modify)", "DELETE (Remove)"]:
                                             st.info("Data modified. Refresh the View Data tab to see changes.")
                                             
@@ -264,12 +358,29 @@ def show_database_admin():
                     
                     with col2:
                         if st.button("📋 Copy Sample Query"):
-                            st.code(sample_queries[query_type])
+                            st.code(sample_query)
                 
         except Exception as e:
             st.error(f"Database connection error: {e}")
             st.info("Please check your database configuration and try again.")
 
+def _iter_backup(uploaded_backup):
+    """Yield (table_name, csv_file, records) for each table in a zip or legacy JSON backup"""
+    if uploaded_backup.name.lower().endswith('.zip'):
+        with zipfile.ZipFile(uploaded_backup) as backup_zip:
+            for member in backup_zip.namelist():
+                with backup_zip.open(member) as csv_file:
+                    yield member.rsplit('.', 1)[0], io.TextIOWrapper(csv_file, encoding='utf-8'), None
+    else:
+        for table_name, records in json.load(uploaded_backup).items():
+            yield table_name, None, records
+
+def _dump_table(table_name):
+    """CSV dump of one table on its own pooled connection (safe to run in a worker thread)"""
+    with get_database_connection() as db:
+        return db.export_table_csv(table_name)
+
+@st.fragment
 def show_database_backup():
     """Database backup and restore functionality"""
     st.markdown("#### 💾 Database Backup & Restore")
@@ -287,25 +398,28 @@ def show_database_backup():
         
         if st.button("📦 Create Backup"):
             if backup_tables:
-                with get_database_connection() as db:
-                    backup_data = {}
-                    for table in backup_tables:
-                        try:
-                            df = db.get_table_data(table)
-                            backup_data[table] = df.to_dict('records')
-                        except Exception as e:
-                            st.error(f"Error backing up {table}: {e}")
+                # One COPY per table, run concurrently on the shared pool and zipped as they finish
+                zip_buffer = io.BytesIO()
+                backed_up_tables = []
+                with ThreadPoolExecutor(max_workers=min(8, len(backup_tables))) as pool, \
+                        zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as backup_zip:
+                    futures = {pool.submit(_dump_table, table): table for table in backup_tables}
+                    for future in as_completed(futures):
+                        table = futures[future]
+                        if future.exception():
+                            st.error(f"Error backing up {table}: {future.exception()}")
+                            continue
+                        backup_zip.writestr(f"{table}.csv", future.result())
+                        backed_up_tables.append(table)
                 
-                if backup_data:
-                    import json
-                    backup_json = json.dumps(backup_data, indent=2, default=str)
+                if backed_up_tables:
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     
                     st.download_button(
                         label="💾 Download Backup File",
-                        data=backup_json,
-                        file_name=f"datalink_backup_{timestamp}.json",
-                        mime="application/json"
+                        data=zip_buffer.getvalue(),
+                        file_name=f"datalink_backup_{timestamp}.zip",
+                        mime="application/zip"
                     )
                     st.success("Backup created successfully!")
             else:
@@ -315,27 +429,25 @@ def show_database_backup():
         st.subheader("Restore Database")
         st.warning("⚠️ Restore will overwrite existing data!")
         
-        uploaded_backup = st.file_uploader("Upload backup file:", type=['json'])
+        uploaded_backup = st.file_uploader("Upload backup file:", type=['zip', 'json'])
         
         if uploaded_backup and st.button("🔄 Restore from Backup"):
             try:
-                backup_data = json.loads(uploaded_backup.read())
+                known_tables = {table[0] for table in _fetch_tables_info()}
                 
                 with get_database_connection() as db:
                     restored_tables = []
-                    for table_name, records in backup_data.items():
+                    for table_name, csv_file, records in _iter_backup(uploaded_backup):
+                        if table_name not in known_tables:
+                            st.error(f"Skipping unknown table in backup: {table_name}")
+                            continue
+                        
                         try:
-                            # Clear existing data
-                            db.execute_query(f"DELETE FROM {table_name}")
-                            
-                            # Insert backup data
-                            for record in records:
-                                columns = list(record.keys())
-                                values = list(record.values())
-                                placeholders = ', '.join(['%s'] * len(values))
-                                
-                                query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
-                                db.execute_query(query, values)
+                            # Clear and reload each table in a single transaction
+                            if csv_file is not None:
+                                db.restore_table_csv(table_name, csv_file)
+                            else:
+                                db.restore_table_records(table_name, records)
                             
                             restored_tables.append(table_name)
                             
@@ -343,6 +455,7 @@ def show_database_backup():
                             st.error(f"Error restoring {table_name}: {e}")
                 
                 if restored_tables:
+                    _clear_metadata_cache()
                     st.success(f"Successfully restored tables: {', '.join(restored_tables)}")
                 else:
                     st.error("No tables were restored successfully.")
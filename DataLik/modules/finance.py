@@ -1,14 +1,74 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime, timedelta
-import json
+from sqlalchemy import text
 from utils.database import get_database_connection
 
+# Low-cardinality label columns that are filtered and grouped on
+CATEGORY_COLUMNS = ('account_type', 'status', 'category')
+
+def _with_categories(df):
+    """Store label columns as pandas categoricals (int codes instead of Python strings)"""
+    return df.astype({column: 'category' for column in CATEGORY_COLUMNS if column in df.columns})
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_accounts():
+    """Chart of accounts from the database, cached across reruns"""
+    with get_database_connection() as db:
+        return _with_categories(db.get_table_data('chart_of_accounts'))
+
+# Account Summary totals, aggregated by the database
+ACCOUNT_TOTALS_QUERY = """
+SELECT account_type, COALESCE(SUM(balance), 0)::float AS balance
+FROM chart_of_accounts
+GROUP BY account_type
+"""
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_account_totals():
+    """Balance totals per account type as (account_type, balance) tuples, cached across reruns"""
+    with get_database_connection() as db:
+        return [tuple(row) for row in db.session.execute(text(ACCOUNT_TOTALS_QUERY)).fetchall()]
+
+# Column dtypes of the session finance DataFrames, so construction skips type inference
+FINANCE_SCHEMAS = {
+    'invoices': {
+        'invoice_id': object, 'customer': object, 'amount': 'float64', 'date': object,
+        'due_date': object, 'status': object, 'description': object
+    },
+    'expenses': {
+        'id': object, 'category': object, 'amount': 'float64', 'date': object,
+        'vendor': object, 'description': object, 'status': object
+    }
+}
+
+def _df_from_records(records, schema):
+    """Column-oriented DataFrame construction with explicit dtypes"""
+    return _with_categories(pd.DataFrame({
+        column: np.array([record[column] for record in records], dtype=dtype)
+        for column, dtype in schema.items()
+    }))
+
+def _append_record(key, record):
+    """Append one record to a session finance DataFrame without rebuilding it from dicts"""
+    finance_data = st.session_state.finance_data
+    new_row = _df_from_records([record], FINANCE_SCHEMAS[key])
+    finance_data[key] = _with_categories(pd.concat([finance_data[key], new_row], ignore_index=True))
+
+def _invoice_status_totals(invoices_df):
+    """Amount totals and invoice counts per status in one pass"""
+    return invoices_df.groupby('status', sort=False, observed=True)['amount'].agg(['sum', 'count'])
+
 def show_finance_modules():
     """Display Finance category modules"""
-    pass  # Data now comes from database
+    
+    # Accounts come from the database; invoices and expenses are per-session sample DataFrames
+    if 'finance_data' not in st.session_state:
+        st.session_state.finance_data = {
+            'invoices': _df_from_records(generate_sample_invoices(), FINANCE_SCHEMAS['invoices']),
+            'expenses': _df_from_records(generate_sample_expenses(), FINANCE_SCHEMAS['expenses'])
+        }
     
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "Accounting", "Invoicing", "Expenses Tracking", "Spreadsheets (BI)", "Documents Management"
@@ -39,14 +99,21 @@ def show_accounting_module():
         st.subheader("Chart of Accounts")
         
         # Load accounts from database
-        with get_database_connection() as db:
-            accounts_df = db.get_table_data('chart_of_accounts')
+        try:
+            accounts_df = _load_accounts()
+        except Exception as e:
+            st.error(f"Error loading accounts: {e}")
+            accounts_df = pd.DataFrame()
         
         if not accounts_df.empty:
             # Display relevant columns
-            display_df = accounts_df[['account_code', 'account_name', 'account_type', 'balance']].copy()
-            display_df['balance'] = display_df['balance'].apply(lambda x: f"${float(x):,.2f}")
-            st.dataframe(display_df, use_container_width=True)
+            display_df = accounts_df[['account_code', 'account_name', 'account_type', 'balance']].astype({'balance': 'float64'})
+            # Currency formatting happens in the frontend, so the column stays numeric and sortable
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                column_config={'balance': st.column_config.NumberColumn(format="dollar")}
+            )
         else:
             st.info("No accounts found in database")
         
@@ -60,30 +127,39 @@ def show_accounting_module():
                 
                 if st.form_submit_button("Add Account"):
                     # Insert into database
-                    with get_database_connection() as db:
-                        query = """
-                        INSERT INTO chart_of_accounts (account_code, account_name, account_type, balance)
-                        VALUES (%s, %s, %s, %s)
-                        """
-                        try:
-                            db.execute_query(query, (account_code, account_name, account_type, 0.0))
-                            st.success(f"Account '{account_name}' added successfully!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error adding account: {e}")
+                    try:
+                        with get_database_connection() as db:
+                            query = """
+                            INSERT INTO chart_of_accounts (account_code, account_name, account_type, balance)
+                            VALUES (:account_code, :account_name, :account_type, :balance)
+                            """
+                            db.execute_query(query, {
+                                'account_code': account_code,
+                                'account_name': account_name,
+                                'account_type': account_type,
+                                'balance': 0.0
+                            })
+                    except Exception as e:
+                        st.error(f"Error adding account: {e}")
+                    else:
+                        _load_accounts.clear()
+                        _load_account_totals.clear()
+                        st.success(f"Account '{account_name}' added successfully!")
+                        st.rerun()
     
     with col2:
         st.subheader("Account Summary")
         
-        # Calculate totals by type from database
-        with get_database_connection() as db:
-            accounts_df = db.get_table_data('chart_of_accounts')
+        # Totals by type, computed in SQL
+        try:
+            account_totals = _load_account_totals()
+        except Exception as e:
+            account_totals = []
+            st.error(f"Error loading account totals: {e}")
         
-        if not accounts_df.empty:
-            summary = accounts_df.groupby('account_type')['balance'].sum().reset_index()
-            
-            for _, row in summary.iterrows():
-                st.metric(row['account_type'], f"${float(row['balance']):,.2f}")
+        if account_totals:
+            for account_type, balance in account_totals:
+                st.metric(account_type, f"${balance:,.2f}")
         else:
             st.info("No account data available")
         
@@ -100,13 +176,17 @@ def show_accounting_module():
 
 def show_invoicing_module():
     """Invoice Management System"""
+    import plotly.express as px
+    
     st.markdown("#### 💳 Invoice Management")
     
+    # Built once and shared by the invoice list and the statistics
+    invoices_df = st.session_state.finance_data['invoices']
+    
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.subheader("Recent Invoices")
-        invoices_df = pd.DataFrame(st.session_state.finance_data['invoices'])
         st.dataframe(invoices_df, use_container_width=True)
         
         # Create new invoice
@@ -132,38 +212,40 @@ def show_invoicing_module():
                         'status': 'Pending',
                         'description': description
                     }
-                    st.session_state.finance_data['invoices'].append(new_invoice)
+                    _append_record('invoices', new_invoice)
                     st.success(f"Invoice {new_invoice['invoice_id']} created!")
                     st.rerun()
     
     with col2:
         st.subheader("Invoice Statistics")
         
-        invoices_df = pd.DataFrame(st.session_state.finance_data['invoices'])
-        
-        total_amount = invoices_df['amount'].sum()
-        pending_amount = invoices_df[invoices_df['status'] == 'Pending']['amount'].sum()
-        paid_amount = invoices_df[invoices_df['status'] == 'Paid']['amount'].sum()
+        status_totals = _invoice_status_totals(invoices_df)
+        total_amount = status_totals['sum'].sum()
+        pending_amount = status_totals['sum'].get('Pending', 0)
+        paid_amount = status_totals['sum'].get('Paid', 0)
         
         st.metric("Total Invoiced", f"${total_amount:,.2f}")
         st.metric("Pending", f"${pending_amount:,.2f}")
         st.metric("Collected", f"${paid_amount:,.2f}")
         
         # Status distribution chart
-        status_counts = invoices_df['status'].value_counts()
-        fig = px.pie(values=status_counts.values, names=status_counts.index, 
+        fig = px.pie(values=status_totals['count'].to_numpy(), names=status_totals.index.to_numpy(), 
                     title="Invoice Status Distribution")
         st.plotly_chart(fig, use_container_width=True)
 
 def show_expenses_module():
     """Expense Tracking System"""
+    import plotly.express as px
+    
     st.markdown("#### 💸 Expense Tracking")
     
+    # Built once and shared by the expense list and the analytics
+    expenses_df = st.session_state.finance_data['expenses']
+    
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.subheader("Recent Expenses")
-        expenses_df = pd.DataFrame(st.session_state.finance_data['expenses'])
         st.dataframe(expenses_df, use_container_width=True)
         
         # Add new expense
@@ -191,42 +273,44 @@ def show_expenses_module():
                         'description': description,
                         'status': 'Recorded'
                     }
-                    st.session_state.finance_data['expenses'].append(new_expense)
+                    _append_record('expenses', new_expense)
                     st.success(f"Expense {new_expense['id']} recorded!")
                     st.rerun()
     
     with col2:
         st.subheader("Expense Analytics")
         
-        expenses_df = pd.DataFrame(st.session_state.finance_data['expenses'])
+        # Dates parsed once and truncated to the month with a numpy cast (no Period objects)
+        months = pd.to_datetime(expenses_df['date']).values.astype('datetime64[M]')
+        monthly_expenses = expenses_df.groupby(months)['amount'].sum()
+        category_expenses = expenses_df.groupby('category', sort=False, observed=True)['amount'].sum()
         
         # Monthly expenses trend
-        expenses_df['month'] = pd.to_datetime(expenses_df['date']).dt.to_period('M')
-        monthly_expenses = expenses_df.groupby('month')['amount'].sum().reset_index()
-        monthly_expenses['month'] = monthly_expenses['month'].astype(str)
-        
-        fig = px.line(monthly_expenses, x='month', y='amount', 
-                     title="Monthly Expenses Trend")
+        fig = px.line(x=monthly_expenses.index, y=monthly_expenses.values, 
+                     labels={'x': 'month', 'y': 'amount'}, title="Monthly Expenses Trend")
+        # Month labels are formatted by Plotly in the browser, not per row in pandas
+        fig.update_xaxes(dtick="M1", tickformat="%Y-%m")
         st.plotly_chart(fig, use_container_width=True)
         
         # Category breakdown
-        category_expenses = expenses_df.groupby('category')['amount'].sum().reset_index()
-        fig2 = px.bar(category_expenses, x='category', y='amount', 
-                     title="Expenses by Category")
+        fig2 = px.bar(x=category_expenses.index, y=category_expenses.values, 
+                     labels={'x': 'category', 'y': 'amount'}, title="Expenses by Category")
         st.plotly_chart(fig2, use_container_width=True)
 
 def show_spreadsheets_module():
     """Business Intelligence Spreadsheets"""
+    import plotly.express as px
+    
     st.markdown("#### 📈 Financial Analytics & BI")
     
     # Financial dashboard with key metrics
     col1, col2, col3, col4 = st.columns(4)
     
     # Calculate financial metrics
-    invoices_df = pd.DataFrame(st.session_state.finance_data['invoices'])
-    expenses_df = pd.DataFrame(st.session_state.finance_data['expenses'])
+    invoices_df = st.session_state.finance_data['invoices']
+    expenses_df = st.session_state.finance_data['expenses']
     
-    total_revenue = invoices_df[invoices_df['status'] == 'Paid']['amount'].sum()
+    total_revenue = _invoice_status_totals(invoices_df)['sum'].get('Paid', 0)
     total_expenses = expenses_df['amount'].sum()
     profit = total_revenue - total_expenses
     
@@ -257,9 +341,10 @@ def show_spreadsheets_module():
     with col2:
         # Cash flow trend (simulated)
         dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='M')
+        i = np.arange(len(dates))
         cash_flow = pd.DataFrame({
             'Date': dates,
-            'Cash Flow': [15000 + i*1000 + (i%3)*2000 for i in range(len(dates))]
+            'Cash Flow': 15000 + i*1000 + (i%3)*2000
         })
         
         fig2 = px.line(cash_flow, x='Date', y='Cash Flow', 
@@ -284,18 +369,12 @@ def show_documents_module():
             {"name": "Expense Receipts Folder", "type": "Folder", "size": "-", "date": "2024-01-01"},
         ]
         
-        for doc in documents:
-            with st.container():
-                col_a, col_b, col_c, col_d = st.columns([3, 1, 1, 1])
-                with col_a:
-                    st.write(f"📁 {doc['name']}")
-                with col_b:
-                    st.write(doc['type'])
-                with col_c:
-                    st.write(doc['size'])
-                with col_d:
-                    st.write(doc['date'])
-                st.markdown("---")
+        # One table element instead of a row of columns per document
+        st.dataframe(
+            pd.DataFrame(documents).rename(columns={'name': 'Name', 'type': 'Type', 'size': 'Size', 'date': 'Date'}),
+            use_container_width=True,
+            hide_index=True
+        )
         
         # Upload new document
         with st.expander("Upload New Document"):
@@ -0,0 +1,50 @@
+import streamlit as st
+import pandas as pd
+
+# Sample data shown by the Human Resources placeholders
+EMPLOYEE_ROWS = [
+    {"Name": "John Smith", "ID": "EMP-001", "Department": "Engineering", "Position": "Senior Developer", "Status": "Active", "Start Date": "2023-01-15"},
+    {"Name": "Sarah Johnson", "ID": "EMP-002", "Department": "Sales", "Position": "Sales Manager", "Status": "Active", "Start Date": "2023-03-01"},
+    {"Name": "Mike Davis", "ID": "EMP-003", "Department": "Marketing", "Position": "Marketing Specialist", "Status": "Active", "Start Date": "2023-06-10"},
+]
+
+@st.cache_data(show_spinner=False)
+def get_employee_df():
+    """Sample employee table"""
+    return pd.DataFrame(EMPLOYEE_ROWS)
+
+def show_employee_panel():
+    """Employee Management System"""
+    st.markdown("#### Employee Management System")
+    
+    st.dataframe(get_employee_df(), use_container_width=True)
+    
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Total Employees", "28")
+    with col_b:
+        st.metric("New Hires (30d)", "2")
+    with col_c:
+        st.metric("Turnover Rate", "3.2%")
+
+def show_recruitment_panel():
+    """Recruitment & Hiring"""
+    st.markdown("#### Recruitment & Hiring")
+    st.markdown("- Job Posting Management")
+    st.markdown("- Candidate Application Tracking")
+    st.markdown("- Interview Scheduling & Feedback")
+    st.markdown("- Offer Management & Onboarding")
+    
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Open Positions", "5")
+    with col_b:
+        st.metric("Active Candidates", "23")
+    with col_c:
+        st.metric("Interviews Scheduled", "8")
+
+# Placeholder panels by module name
+MODULE_PANELS = {
+    "Employee Management": show_employee_panel,
+    "Recruitment": show_recruitment_panel,
+}
@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+
+# Sample data shown by the Logistics placeholders
+INVENTORY_ROWS = [
+    {"Product": "Laptop Dell XPS", "SKU": "LAP-001", "Stock": 25, "Reorder Point": 10, "Unit Cost": "$800", "Total Value": "$20,000"},
+    {"Product": "Office Chair", "SKU": "CHR-002", "Stock": 8, "Reorder Point": 15, "Unit Cost": "$150", "Total Value": "$1,200"},
+    {"Product": "Printer HP LaserJet", "SKU": "PRT-003", "Stock": 45, "Reorder Point": 20, "Unit Cost": "$300", "Total Value": "$13,500"},
+]
+
+@st.cache_data(show_spinner=False)
+def get_inventory_df():
+    """Sample inventory table"""
+    return pd.DataFrame(INVENTORY_ROWS)
+
+def show_inventory_panel():
+    """Inventory Management System"""
+    st.markdown("#### Inventory Management System")
+    
+    st.dataframe(get_inventory_df(), use_container_width=True)
+    
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Total Items", "78")
+    with col_b:
+        st.metric("Low Stock Alerts", "3")
+    with col_c:
+        st.metric("Total Inventory Value", "$34,700")
+
+def show_manufacturing_panel():
+    """Manufacturing Operations"""
+    st.markdown("#### Manufacturing Operations")
+    st.markdown("- Production Planning & Scheduling")
+    st.markdown("- Work Orders & Job Tracking")
+    st.markdown("- Quality Control & Inspections")
+    st.markdown("- Equipment Maintenance")
+    
+    # Production metrics
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Active Work Orders", "12")
+    with col_b:
+        st.metric("Production Efficiency", "94.2%")
+    with col_c:
+        st.metric("Quality Score", "98.1%")
+
+def show_plm_panel():
+    """Product Lifecycle Management"""
+    st.markdown("#### Product Lifecycle Management")
+    st.markdown("- Product Development Pipeline")
+    st.markdown("- Design & Engineering Documentation")
+    st.markdown("- Version Control & Change Management")
+    st.markdown("- Compliance & Regulatory Tracking")
+
+# Placeholder panels by module name
+MODULE_PANELS = {
+    "Inventory Management": show_inventory_panel,
+    "Manufacturing": show_manufacturing_panel,
+    "PLM (Product Lifecycle)": show_plm_panel,
+}
@@ -0,0 +1,39 @@
+import streamlit as st
+
+def show_discuss_panel():
+    """Team Communication Hub"""
+    st.markdown("#### Team Communication Hub")
+    st.markdown("- Team Chat & Messaging")
+    st.markdown("- Discussion Channels by Department")
+    st.markdown("- File Sharing & Collaboration")
+    st.markdown("- Announcement Broadcasting")
+    
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.metric("Active Channels", "12")
+        st.metric("Messages Today", "156")
+    with col_b:
+        st.metric("Online Users", "18")
+        st.metric("Files Shared", "23")
+
+def show_knowledge_base_panel():
+    """Knowledge Management System"""
+    st.markdown("#### Knowledge Management System")
+    st.markdown("- Company Policies & Procedures")
+    st.markdown("- Technical Documentation")
+    st.markdown("- FAQ & Troubleshooting Guides")
+    st.markdown("- Training Materials & Resources")
+    
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.metric("Articles", "89")
+        st.metric("Views This Month", "342")
+    with col_b:
+        st.metric("Contributors", "15")
+        st.metric("Updates This Week", "7")
+
+# Placeholder panels by module name
+MODULE_PANELS = {
+    "Discuss": show_discuss_panel,
+    "Knowledge Base": show_knowledge_base_panel,
+}
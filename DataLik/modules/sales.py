@@ -1,19 +1,90 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.database import get_database_connection
 
+# Sales pipeline stages, in funnel order
+PIPELINE_STAGES = ["Lead", "Qualified", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
+CLOSED_STAGES = ("Closed Won", "Closed Lost")
+
+def _deal_stage_summary(deals_df):
+    """Deal count ('size') and total value ('sum') per pipeline stage in one groupby"""
+    return deals_df.groupby('stage', sort=False, observed=True)['value'].agg(['size', 'sum']).reindex(PIPELINE_STAGES, fill_value=0)
+
+# Customer value segments: upper bounds (inclusive) of every segment but the last
+SEGMENT_EDGES = np.array([1000.0, 5000.0])
+SEGMENT_LABELS = ['Bronze', 'Silver', 'Gold']
+
+# Above this many points, line charts switch from SVG to WebGL rendering
+WEBGL_POINT_THRESHOLD = 1000
+
+def _line_figure(x, y, title):
+    """Line chart figure, drawn with WebGL once the series gets long"""
+    trace = go.Scattergl if len(x) > WEBGL_POINT_THRESHOLD else go.Scatter
+    return go.Figure(trace(x=x, y=y, mode='lines'), layout_title_text=title)
+
+def _monthly_counts(dates):
+    """Count dates per calendar month with np.bincount as ('YYYY-MM' labels, counts); empty months count 0"""
+    dates = dates.dropna()
+    if dates.empty:
+        return [], np.array([], dtype=np.int64)
+    month_index = dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1
+    first = month_index.min()
+    counts = np.bincount(month_index - first)
+    months = [f"{(first + i) // 12}-{(first + i) % 12 + 1:02d}" for i in range(len(counts))]
+    return months, counts
+
+def _histogram_figure(values, title, bins='auto'):
+    """Histogram binned with numpy, so only bin counts are sent to the browser"""
+    counts, edges = np.histogram(values, bins=bins)
+    return go.Figure(
+        go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)),
+        layout_title_text=title
+    )
+
+# Date columns kept as datetime64 so filters compare timestamps, not strings
+DATE_COLUMNS = ('created_date', 'close_date')
+
+def _records_df(records):
+    """Session sales DataFrame with its date columns parsed once"""
+    df = pd.DataFrame(records)
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column])
+    df = _with_categories(df)
+    # Remaining text columns as contiguous Arrow strings (pyarrow ships with Streamlit)
+    return df.astype({column: 'string[pyarrow]' for column in df.select_dtypes('object').columns})
+
+# Low-cardinality label columns, stored as categoricals; stage has a fixed set so deals can move between stages
+CATEGORY_DTYPES = {
+    'stage': pd.CategoricalDtype(PIPELINE_STAGES),
+    'status': 'category',
+    'industry': 'category',
+    'source': 'category',
+    'interest': 'category'
+}
+
+def _with_categories(df):
+    """Store label columns as pandas categoricals (int codes instead of Python strings)"""
+    return df.astype({column: dtype for column, dtype in CATEGORY_DTYPES.items() if column in df.columns})
+
+def _append_record(key, record):
+    """Append one record to a session sales DataFrame without rebuilding it from dicts"""
+    sales_data = st.session_state.sales_data
+    # concat turns categoricals with differing categories back into objects, so re-cast
+    sales_data[key] = _with_categories(pd.concat([sales_data[key], _records_df([record])], ignore_index=True))
+
 def show_sales_modules():
     """Display Sales category modules"""
     
     # Initialize sales data in session state
     if 'sales_data' not in st.session_state:
         st.session_state.sales_data = {
-            'customers': generate_sample_customers(),
-            'leads': generate_sample_leads(),
-            'deals': generate_sample_deals(),
+            'customers': _records_df(generate_sample_customers()),
+            'leads': _records_df(generate_sample_leads()),
+            'deals': _records_df(generate_sample_deals()),
             'contacts': generate_sample_contacts(),
             'sales_activities': generate_sample_activities()
         }
@@ -45,12 +116,12 @@ def show_crm_module():
     
     with col1:
         st.subheader("Customer Database")
-        customers_df = pd.DataFrame(st.session_state.sales_data['customers'])
+        customers_df = st.session_state.sales_data['customers']
         
         # Search and filter
         search_term = st.text_input("🔍 Search customers")
         if search_term:
-            customers_df = customers_df[customers_df['name'].str.contains(search_term, case=False, na=False)]
+            customers_df = customers_df[customers_df['name'].str.contains(search_term, case=False, na=False, regex=False)]
         
         st.dataframe(customers_df, use_container_width=True)
         
@@ -86,14 +157,14 @@ def show_crm_module():
                         'total_value': 0.0,
                         'notes': notes
                     }
-                    st.session_state.sales_data['customers'].append(new_customer)
+                    _append_record('customers', new_customer)
                     st.success(f"Customer '{customer_name}' added successfully!")
                     st.rerun()
     
     with col2:
         st.subheader("CRM Statistics")
         
-        customers_df = pd.DataFrame(st.session_state.sales_data['customers'])
+        customers_df = st.session_state.sales_data['customers']
         
         # Key metrics
         total_customers = len(customers_df)
@@ -107,42 +178,39 @@ def show_crm_module():
         # Customer distribution by industry
         if not customers_df.empty:
             industry_counts = customers_df['industry'].value_counts()
-            fig = px.pie(values=industry_counts.values, names=industry_counts.index, 
-                        title="Customers by Industry")
+            fig = go.Figure(go.Pie(values=industry_counts.to_numpy(), labels=industry_counts.index.to_numpy()), 
+                            layout_title_text="Customers by Industry")
             st.plotly_chart(fig, use_container_width=True)
         
         # Customer acquisition sources
         if not customers_df.empty:
             source_counts = customers_df['source'].value_counts()
-            fig2 = px.bar(x=source_counts.values, y=source_counts.index, 
-                         orientation='h', title="Customer Sources")
+            fig2 = go.Figure(go.Bar(x=source_counts.to_numpy(), y=source_counts.index.to_numpy(), orientation='h'), 
+                             layout_title_text="Customer Sources")
             st.plotly_chart(fig2, use_container_width=True)
 
 def show_sales_processes_module():
     """Sales Pipeline and Process Management"""
     st.markdown("#### 🔄 Sales Process Management")
     
-    # Sales pipeline stages
-    pipeline_stages = ["Lead", "Qualified", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
-    
     col1, col2 = st.columns([3, 1])
     
     with col1:
         st.subheader("Sales Pipeline")
         
         # Pipeline visualization
-        deals_df = pd.DataFrame(st.session_state.sales_data['deals'])
-        stage_counts = deals_df['stage'].value_counts().reindex(pipeline_stages, fill_value=0)
-        stage_values = deals_df.groupby('stage')['value'].sum().reindex(pipeline_stages, fill_value=0)
+        deals_df = st.session_state.sales_data['deals']
+        stage_summary = _deal_stage_summary(deals_df)
         
         # Create pipeline funnel
         pipeline_data = pd.DataFrame({
-            'Stage': pipeline_stages,
-            'Count': stage_counts.values,
-            'Value': stage_values.values
+            'Stage': PIPELINE_STAGES,
+            'Count': stage_summary['size'].values,
+            'Value': stage_summary['sum'].values
         })
         
-        fig = px.funnel(pipeline_data, x='Count', y='Stage', title="Sales Pipeline")
+        fig = go.Figure(go.Funnel(x=pipeline_data['Count'].to_numpy(), y=pipeline_data['Stage'].to_numpy()), 
+                        layout_title_text="Sales Pipeline")
         st.plotly_chart(fig, use_container_width=True)
         
         # Pipeline table
@@ -152,25 +220,27 @@ def show_sales_processes_module():
     with col2:
         st.subheader("Pipeline Metrics")
         
-        total_pipeline_value = deals_df['value'].sum()
-        active_deals = len(deals_df[~deals_df['stage'].isin(['Closed Won', 'Closed Lost'])])
-        won_deals = len(deals_df[deals_df['stage'] == 'Closed Won'])
+        total_pipeline_value = stage_summary['sum'].sum()
+        active_deals = stage_summary['size'].drop(list(CLOSED_STAGES)).sum()
+        won_deals = stage_summary.loc['Closed Won', 'size']
         
         st.metric("Pipeline Value", f"${total_pipeline_value:,.2f}")
         st.metric("Active Deals", active_deals)
         st.metric("Won Deals", won_deals)
         
         # Win rate calculation
-        total_closed = len(deals_df[deals_df['stage'].isin(['Closed Won', 'Closed Lost'])])
+        total_closed = stage_summary.loc[list(CLOSED_STAGES), 'size'].sum()
         win_rate = (won_deals / total_closed * 100) if total_closed > 0 else 0
         st.metric("Win Rate", f"{win_rate:.1f}%")
         
         # Sales activities
         st.markdown("#### Recent Activities")
         activities = st.session_state.sales_data['sales_activities']
-        for activity in activities[-5:]:  # Show last 5 activities
-            st.write(f"🔸 {activity['type']}: {activity['description']}")
-            st.caption(f"{activity['date']} - {activity['rep']}")
+        # Show last 5 activities as a single markdown element
+        st.markdown("\n\n".join(
+            f"🔸 {activity['type']}: {activity['description']}  \n:gray[{activity['date']} - {activity['rep']}]"
+            for activity in activities[-5:]
+        ))
 
 def show_lead_management_module():
     """Lead Generation and Management"""
@@ -180,7 +250,7 @@ def show_lead_management_module():
     
     with col1:
         st.subheader("Lead Database")
-        leads_df = pd.DataFrame(st.session_state.sales_data['leads'])
+        leads_df = st.session_state.sales_data['leads']
         
         # Lead status filter
         status_filter = st.selectbox("Filter by Status", 
@@ -225,14 +295,14 @@ def show_lead_management_module():
                         'last_contact': '-',
                         'notes': lead_notes
                     }
-                    st.session_state.sales_data['leads'].append(new_lead)
+                    _append_record('leads', new_lead)
                     st.success(f"Lead '{lead_name}' added successfully!")
                     st.rerun()
     
     with col2:
         st.subheader("Lead Analytics")
         
-        leads_df = pd.DataFrame(st.session_state.sales_data['leads'])
+        leads_df = st.session_state.sales_data['leads']
         
         # Lead metrics
         total_leads = len(leads_df)
@@ -251,38 +321,41 @@ def show_lead_management_module():
         # Lead sources
         if not leads_df.empty:
             source_counts = leads_df['source'].value_counts()
-            fig = px.bar(x=source_counts.values, y=source_counts.index, 
-                        orientation='h', title="Lead Sources")
+            fig = go.Figure(go.Bar(x=source_counts.to_numpy(), y=source_counts.index.to_numpy(), orientation='h'), 
+                            layout_title_text="Lead Sources")
             st.plotly_chart(fig, use_container_width=True)
         
         # Lead score distribution
         if not leads_df.empty:
-            fig2 = px.histogram(leads_df, x='score', title="Lead Score Distribution")
+            fig2 = _histogram_figure(leads_df['score'].to_numpy(), "Lead Score Distribution")
             st.plotly_chart(fig2, use_container_width=True)
 
 def show_deal_tracking_module():
     """Deal and Opportunity Tracking"""
     st.markdown("#### 💼 Deal Tracking")
     
-    deals_df = pd.DataFrame(st.session_state.sales_data['deals'])
+    deals_df = st.session_state.sales_data['deals']
+    stage_summary = _deal_stage_summary(deals_df)
     
     # Deal summary cards
     col1, col2, col3, col4 = st.columns(4)
     
+    total_deals = int(stage_summary['size'].sum())
+    total_value = stage_summary['sum'].sum()
+    
     with col1:
-        total_deals = len(deals_df)
         st.metric("Total Deals", total_deals)
     
     with col2:
-        pipeline_value = deals_df[~deals_df['stage'].isin(['Closed Won', 'Closed Lost'])]['value'].sum()
+        pipeline_value = stage_summary['sum'].drop(list(CLOSED_STAGES)).sum()
         st.metric("Pipeline Value", f"${pipeline_value:,.2f}")
     
     with col3:
-        won_value = deals_df[deals_df['stage'] == 'Closed Won']['value'].sum()
+        won_value = stage_summary.loc['Closed Won', 'sum']
         st.metric("Won Value", f"${won_value:,.2f}")
     
     with col4:
-        avg_deal_size = deals_df['value'].mean()
+        avg_deal_size = total_value / total_deals if total_deals else 0.0
         st.metric("Avg Deal Size", f"${avg_deal_size:,.2f}")
     
     # Deal management interface
@@ -292,8 +365,7 @@ def show_deal_tracking_module():
         st.subheader("Active Deals")
         
         # Filter deals
-        stage_filter = st.selectbox("Filter by Stage", 
-            ["All", "Lead", "Qualified", "Proposal", "Negotiation", "Closed Won", "Closed Lost"])
+        stage_filter = st.selectbox("Filter by Stage", ["All", *PIPELINE_STAGES])
         
         if stage_filter != "All":
             filtered_deals = deals_df[deals_df['stage'] == stage_filter]
@@ -306,17 +378,14 @@ def show_deal_tracking_module():
         with st.expander("Update Deal"):
             if not deals_df.empty:
                 deal_to_update = st.selectbox("Select Deal", deals_df['name'].tolist())
-                new_stage = st.selectbox("New Stage", 
-                    ["Lead", "Qualified", "Proposal", "Negotiation", "Closed Won", "Closed Lost"])
+                new_stage = st.selectbox("New Stage", PIPELINE_STAGES)
                 update_notes = st.text_area("Update Notes")
                 
                 if st.button("Update Deal"):
                     # Update the deal in session state
-                    for i, deal in enumerate(st.session_state.sales_data['deals']):
-                        if deal['name'] == deal_to_update:
-                            st.session_state.sales_data['deals'][i]['stage'] = new_stage
-                            st.session_state.sales_data['deals'][i]['last_update'] = datetime.now().strftime('%Y-%m-%d')
-                            break
+                    deals_df.loc[deals_df['name'] == deal_to_update, ['stage', 'last_update']] = [
+                        new_stage, datetime.now().strftime('%Y-%m-%d')
+                    ]
                     
                     # Add activity record
                     activity = {
@@ -334,28 +403,25 @@ def show_deal_tracking_module():
     with col2:
         st.subheader("Deal Analytics")
         
-        # Deal stage distribution
-        stage_counts = deals_df['stage'].value_counts()
-        fig = px.pie(values=stage_counts.values, names=stage_counts.index, 
-                    title="Deals by Stage")
+        # Deal stage distribution (stages without deals are dropped, as value_counts did)
+        stage_counts = stage_summary['size'][stage_summary['size'] > 0]
+        fig = go.Figure(go.Pie(values=stage_counts.to_numpy(), labels=stage_counts.index.to_numpy()), 
+                        layout_title_text="Deals by Stage")
         st.plotly_chart(fig, use_container_width=True)
         
         # Monthly deal closure trend
-        deals_df['month'] = pd.to_datetime(deals_df['close_date']).dt.to_period('M')
-        monthly_closures = deals_df[deals_df['stage'] == 'Closed Won'].groupby('month').size().reset_index(name='count')
-        monthly_closures['month'] = monthly_closures['month'].astype(str)
+        months, closures = _monthly_counts(deals_df.loc[deals_df['stage'] == 'Closed Won', 'close_date'])
         
-        if not monthly_closures.empty:
-            fig2 = px.line(monthly_closures, x='month', y='count', 
-                          title="Monthly Deal Closures")
+        if len(closures):
+            fig2 = _line_figure(months, closures, "Monthly Deal Closures")
             st.plotly_chart(fig2, use_container_width=True)
 
 def show_customer_analytics_module():
     """Customer Analytics and Insights"""
     st.markdown("#### 📊 Customer Analytics")
     
-    customers_df = pd.DataFrame(st.session_state.sales_data['customers'])
-    deals_df = pd.DataFrame(st.session_state.sales_data['deals'])
+    customers_df = st.session_state.sales_data['customers']
+    deals_df = st.session_state.sales_data['deals']
     
     # Customer analytics dashboard
     col1, col2, col3, col4 = st.columns(4)
@@ -369,7 +435,7 @@ def show_customer_analytics_module():
         st.metric("Customer Retention", f"{retention_rate:.1f}%")
     
     with col3:
-        new_customers = len(customers_df[customers_df['created_date'] >= (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')])
+        new_customers = (customers_df['created_date'] >= pd.Timestamp.now() - pd.Timedelta(days=30)).sum()
         st.metric("New Customers (30d)", new_customers)
     
     with col4:
@@ -382,39 +448,35 @@ def show_customer_analytics_module():
     with col1:
         # Customer value distribution
         if not customers_df.empty and customers_df['total_value'].sum() > 0:
-            fig = px.histogram(customers_df, x='total_value', title="Customer Value Distribution")
+            fig = _histogram_figure(customers_df['total_value'].to_numpy(dtype=float), "Customer Value Distribution")
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No customer value data available")
         
         # Customer acquisition trend
-        customers_df['month'] = pd.to_datetime(customers_df['created_date']).dt.to_period('M')
-        monthly_customers = customers_df.groupby('month').size().reset_index(name='count')
-        monthly_customers['month'] = monthly_customers['month'].astype(str)
+        months, new_per_month = _monthly_counts(customers_df['created_date'])
         
-        if not monthly_customers.empty:
-            fig2 = px.line(monthly_customers, x='month', y='count', 
-                          title="Customer Acquisition Trend")
+        if len(new_per_month):
+            fig2 = _line_figure(months, new_per_month, "Customer Acquisition Trend")
             st.plotly_chart(fig2, use_container_width=True)
     
     with col2:
         # Customer segmentation
         if not customers_df.empty:
-            # Segment by total value
-            customers_df['segment'] = pd.cut(customers_df['total_value'], 
-                                           bins=[0, 1000, 5000, float('inf')], 
-                                           labels=['Bronze', 'Silver', 'Gold'])
-            segment_counts = customers_df['segment'].value_counts()
+            # Segment by total value: (0, 1000] Bronze, (1000, 5000] Silver, above Gold
+            values = customers_df['total_value'].to_numpy(dtype=float)
+            segment_codes = np.searchsorted(SEGMENT_EDGES, values[values > 0])
+            segment_counts = np.bincount(segment_codes, minlength=len(SEGMENT_LABELS))
             
-            fig3 = px.pie(values=segment_counts.values, names=segment_counts.index, 
-                         title="Customer Segments")
+            fig3 = go.Figure(go.Pie(values=segment_counts, labels=SEGMENT_LABELS), 
+                             layout_title_text="Customer Segments")
             st.plotly_chart(fig3, use_container_width=True)
         
         # Industry analysis
         if not customers_df.empty:
-            industry_value = customers_df.groupby('industry')['total_value'].sum().reset_index()
-            fig4 = px.bar(industry_value, x='industry', y='total_value', 
-                         title="Revenue by Industry")
+            industry_value = customers_df.groupby('industry', sort=False, observed=True)['total_value'].sum()
+            fig4 = go.Figure(go.Bar(x=industry_value.index.to_numpy(), y=industry_value.to_numpy()), 
+                             layout_title_text="Revenue by Industry")
             st.plotly_chart(fig4, use_container_width=True)
 
 def generate_sample_customers():
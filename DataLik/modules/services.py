@@ -0,0 +1,33 @@
+import streamlit as st
+import pandas as pd
+
+# Sample data shown by the Services placeholders
+PROJECT_ROWS = [
+    {"Project": "Website Redesign", "Status": "In Progress", "Progress": "75%", "Due Date": "2024-02-15", "Team Size": "4", "Budget": "$15,000"},
+    {"Project": "Mobile App Development", "Status": "Planning", "Progress": "25%", "Due Date": "2024-04-30", "Team Size": "6", "Budget": "$50,000"},
+    {"Project": "Database Migration", "Status": "Completed", "Progress": "100%", "Due Date": "2024-01-20", "Team Size": "3", "Budget": "$8,000"},
+]
+
+@st.cache_data(show_spinner=False)
+def get_project_df():
+    """Sample project table"""
+    return pd.DataFrame(PROJECT_ROWS)
+
+def show_project_panel():
+    """Project Management Hub"""
+    st.markdown("#### Project Management Hub")
+    
+    st.dataframe(get_project_df(), use_container_width=True)
+    
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Active Projects", "8")
+    with col_b:
+        st.metric("On-Time Delivery", "92%")
+    with col_c:
+        st.metric("Team Utilization", "87%")
+
+# Placeholder panels by module name
+MODULE_PANELS = {
+    "Project Management": show_project_panel,
+}
@@ -1,15 +1,31 @@
 import streamlit as st
 import yaml
-import streamlit_authenticator as stauth
+from functools import wraps
 from pathlib import Path
+from types import MappingProxyType
+
+# libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+USER_CONFIG_FILE = Path("data/users.yaml")
 
 def load_user_config():
     """Load user configuration from YAML file"""
-    config_file = Path("data/users.yaml")
+    mtime = USER_CONFIG_FILE.stat().st_mtime if USER_CONFIG_FILE.exists() else 0
+    return _load_user_config(mtime)
+
+@st.cache_data(show_spinner=False)
+def _load_user_config(mtime):
+    """Parse the user configuration once per file modification time
+
+    st.cache_data hands every caller its own copy, so the authenticator can
+    update the credentials dict without leaking state between sessions.
+    """
+    config_file = USER_CONFIG_FILE
     
-    if config_file.exists():
+    if mtime:
         with open(config_file, 'r') as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=YAML_LOADER)
     else:
         # Default configuration if file doesn't exist
         config = {
@@ -60,6 +76,9 @@ def check_authentication():
     if st.session_state.get('authenticated', False):
         return True
     
+    # Only the login path needs streamlit-authenticator (and bcrypt)
+    import streamlit_authenticator as stauth
+    
     # Load configuration
     config = load_user_config()
     
@@ -128,26 +147,26 @@ def get_user_role():
     """Get current user's role"""
     return st.session_state.get('user_role', 'User')
 
+# Permission level of each role
+ROLE_LEVELS = MappingProxyType({
+    'User': 1,
+    'Analyst': 2,
+    'Manager': 3,
+    'Admin': 4
+})
+
 def has_permission(required_role):
     """Check if user has required permission level"""
-    role_hierarchy = {
-        'User': 1,
-        'Analyst': 2,
-        'Manager': 3,
-        'Admin': 4
-    }
-    
-    current_role = get_user_role()
-    current_level = role_hierarchy.get(current_role, 0)
-    required_level = role_hierarchy.get(required_role, 0)
-    
-    return current_level >= required_level
+    return ROLE_LEVELS.get(get_user_role(), 0) >= ROLE_LEVELS.get(required_role, 0)
 
 def require_role(required_role):
     """Decorator to require specific role for a function"""
+    required_level = ROLE_LEVELS.get(required_role, 0)
+    
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            if has_permission(required_role):
+            if ROLE_LEVELS.get(get_user_role(), 0) >= required_level:
                 return func(*args, **kwargs)
             else:
                 st.error(f"❌ Access denied. {required_role} role required.")
@@ -0,0 +1,45 @@
+from types import MappingProxyType
+
+# Business categories and their modules
+BUSINESS_CATEGORIES = MappingProxyType({
+    "🏠 Dashboard": {
+        "description": "Overview of your business operations",
+        "modules": ("Business Overview", "Quick Stats", "Recent Activity")
+    },
+    "📊 Data Analysis": {
+        "description": "Analytics, reporting, and business intelligence",
+        "modules": ("Dashboard Analytics", "Data Upload", "Advanced Analytics", "Reports", "Collaboration")
+    },
+    "💰 Finance": {
+        "description": "Financial management and accounting",
+        "modules": ("Accounting", "Invoicing", "Expenses Tracking", "Spreadsheets (BI)", "Documents Management")
+    },
+    "🛒 Sales": {
+        "description": "Customer relationship and sales management",
+        "modules": ("CRM Systems", "Sales Processes", "Lead Management", "Deal Tracking", "Customer Analytics")
+    },
+    "📦 Logistics": {
+        "description": "Inventory, manufacturing, and supply chain",
+        "modules": ("Inventory Management", "Manufacturing", "PLM (Product Lifecycle)", "Purchase Orders", "Maintenance")
+    },
+    "👥 Human Resources": {
+        "description": "Employee management and HR operations",
+        "modules": ("Employee Management", "Recruitment", "Referrals", "Fleet Management", "Time Off", "Appraisals")
+    },
+    "🔧 Services": {
+        "description": "Project management and service delivery",
+        "modules": ("Project Management", "Timesheets", "Field Service", "Service Analytics")
+    },
+    "⚡ Productivity": {
+        "description": "Communication, collaboration, and knowledge management",
+        "modules": ("Discuss", "Approvals", "Knowledge Base", "Team Collaboration", "Workflow Automation")
+    },
+    "🗄️ Database Admin": {
+        "description": "Database management and administration",
+        "modules": ("View Tables", "Manage Data", "Backup & Restore", "Query Interface")
+    }
+})
+
+# Category lookup tables for the sidebar selector
+CATEGORY_KEYS = tuple(BUSINESS_CATEGORIES.keys())
+CATEGORY_INDEX = MappingProxyType({key: i for i, key in enumerate(CATEGORY_KEYS)})
@@ -1,63 +1,103 @@
-import plotly.express as px
+import streamlit as st
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from utils.data_processor import ensure_datetime, linear_trend
 
+# Above this many points, line traces switch from SVG to WebGL (same cut-off as plotly express)
+WEBGL_POINT_THRESHOLD = 1000
+# Reserved daily_aggregates column holding the row count, clear of any column in uploaded data
+ORDER_COUNT_COLUMN = '_order_count'
+
+def _message_figure(text):
+    """Placeholder figure carrying a single centered message, built in one constructor call"""
+    return go.Figure(layout=dict(annotations=[dict(text=text, x=0.5, y=0.5, showarrow=False)]))
+
+def _scatter_type(n_points):
+    """Scatter trace class for a series of n_points - WebGL once it gets long"""
+    return go.Scattergl if n_points > WEBGL_POINT_THRESHOLD else go.Scatter
+
+def _centered_moving_average(y, window):
+    """Centered rolling mean via a cumulative-sum difference (matches rolling(window, center=True))"""
+    y = np.asarray(y, dtype=float)
+    out = np.full(y.shape[0], np.nan)
+    if y.shape[0] >= window:
+        csum = np.concatenate(([0.0], np.cumsum(y)))
+        start = window // 2
+        out[start:start + y.shape[0] - window + 1] = (csum[window:] - csum[:-window]) / window
+    return out
+
+@st.cache_data(show_spinner=False)
+def daily_aggregates(data):
+    """Daily order count plus daily sums of every numeric column, from one groupby over date"""
+    grouped = data.groupby(ensure_datetime(data['date']))
+    daily = grouped.sum(numeric_only=True)
+    daily.insert(0, ORDER_COUNT_COLUMN, grouped.size())
+    return daily.reset_index()
+
+@st.cache_data(show_spinner=False)
 def create_sales_chart(data):
     """Create sales performance chart"""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("No data available")
         return fig
     
     if 'date' in data.columns:
         # Daily sales volume
-        daily_sales = data.groupby('date').size().reset_index(name='orders')
-        fig = px.line(daily_sales, x='date', y='orders', 
-                     title='Daily Order Volume',
-                     labels={'orders': 'Number of Orders', 'date': 'Date'})
-        fig.update_traces(line_color='#FF6B35')
+        daily_sales = daily_aggregates(data)
+        fig = go.Figure(
+            data=[_scatter_type(len(daily_sales))(
+                x=daily_sales['date'], y=daily_sales[ORDER_COUNT_COLUMN],
+                mode='lines', name='Orders', line=dict(color='#FF6B35')
+            )],
+            layout=dict(title='Daily Order Volume', xaxis=dict(title='Date'), yaxis=dict(title='Number of Orders'),
+                        uirevision='daily_orders')
+        )
     else:
         # If no date column, show product sales
         if 'product' in data.columns:
+            import plotly.express as px
             product_sales = data['product'].value_counts().reset_index()
             product_sales.columns = ['product', 'count']
             fig = px.bar(product_sales.head(10), x='product', y='count',
                         title='Top 10 Products by Sales Volume')
         else:
-            fig = go.Figure()
-            fig.add_annotation(text="Insufficient data for sales chart", x=0.5, y=0.5, showarrow=False)
+            fig = _message_figure("Insufficient data for sales chart")
     
     fig.update_layout(height=400)
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_revenue_chart(data):
     """Create revenue trend chart"""
     if data.empty or 'revenue' not in data.columns:
-        fig = go.Figure()
-        fig.add_annotation(text="No revenue data available", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("No revenue data available")
         return fig
     
     if 'date' in data.columns:
         # Daily revenue
-        daily_revenue = data.groupby('date')['revenue'].sum().reset_index()
-        
-        fig = px.line(daily_revenue, x='date', y='revenue',
-                     title='Daily Revenue Trend',
-                     labels={'revenue': 'Revenue ($)', 'date': 'Date'})
-        
-        # Add moving average
-        daily_revenue['ma_7'] = daily_revenue['revenue'].rolling(window=7, min_periods=1).mean()
-        fig.add_scatter(x=daily_revenue['date'], y=daily_revenue['ma_7'],
-                       mode='lines', name='7-day MA', line=dict(dash='dash'))
+        daily_revenue = daily_aggregates(data)[['date', 'revenue']]
+        scatter = _scatter_type(len(daily_revenue))
         
-        fig.update_traces(line_color='#28A745')
+        # Revenue plus its 7-day moving average, built in one go
+        ma_7 = daily_revenue['revenue'].rolling(window=7, min_periods=1).mean()
+        fig = go.Figure(
+            data=[
+                scatter(x=daily_revenue['date'], y=daily_revenue['revenue'],
+                        mode='lines', name='Revenue', line=dict(color='#28A745')),
+                scatter(x=daily_revenue['date'], y=ma_7,
+                        mode='lines', name='7-day MA', line=dict(color='#28A745', dash='dash')),
+            ],
+            layout=dict(title='Daily Revenue Trend', xaxis=dict(title='Date'), yaxis=dict(title='Revenue ($)'),
+                        uirevision='daily_revenue')
+        )
     else:
+        import plotly.express as px
+        
         # Show revenue by category if available
         if 'category' in data.columns:
-            category_revenue = data.groupby('category')['revenue'].sum().reset_index()
+            category_revenue = data.groupby('category', observed=True)['revenue'].sum().reset_index()
             fig = px.bar(category_revenue, x='category', y='revenue',
                         title='Revenue by Category')
         else:
@@ -66,17 +106,19 @@ def create_revenue_chart(data):
     fig.update_layout(height=400)
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_customer_chart(data):
     """Create customer analysis chart"""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No customer data available", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("No customer data available")
         return fig
     
+    import plotly.express as px
+    
     if 'customer' in data.columns and 'date' in data.columns:
         # Customer acquisition over time
-        customer_first_purchase = data.groupby('customer')['date'].min().reset_index()
-        customer_first_purchase['month'] = pd.to_datetime(customer_first_purchase['date']).dt.to_period('M')
+        customer_first_purchase = data.groupby('customer', observed=True)['date'].min().reset_index()
+        customer_first_purchase['month'] = ensure_datetime(customer_first_purchase['date']).dt.to_period('M')
         monthly_new_customers = customer_first_purchase.groupby('month').size().reset_index(name='new_customers')
         monthly_new_customers['month'] = monthly_new_customers['month'].dt.to_timestamp()
         
@@ -94,29 +136,36 @@ def create_customer_chart(data):
                           title='Customer Transaction Frequency Distribution',
                           labels={'transactions': 'Number of Transactions', 'count': 'Number of Customers'})
     else:
-        fig = go.Figure()
-        fig.add_annotation(text="No customer data available", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("No customer data available")
     
     fig.update_layout(height=400)
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_correlation_heatmap(data):
     """Create correlation heatmap for numeric columns"""
     if data.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No data available", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("No data available")
         return fig
     
-    # Calculate correlation matrix
-    corr_matrix = data.corr()
+    numeric = data.select_dtypes(include=np.number)
+    if numeric.shape[1] < 2:
+        fig = _message_figure("Need at least two numeric columns")
+        return fig
+    
+    # Complete data: one BLAS call; with gaps, pandas' pairwise-complete correlation
+    if numeric.notna().all().all():
+        corr_matrix = np.corrcoef(numeric.to_numpy(dtype=np.float64), rowvar=False)
+    else:
+        corr_matrix = numeric.corr().to_numpy()
     
     fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix.values,
-        x=corr_matrix.columns,
-        y=corr_matrix.columns,
+        z=corr_matrix,
+        x=numeric.columns,
+        y=numeric.columns,
         colorscale='RdBu',
         zmid=0,
-        text=corr_matrix.round(2).values,
+        text=np.round(corr_matrix, 2),
         texttemplate='%{text}',
         textfont={"size": 10},
         hoverongaps=False
@@ -130,78 +179,73 @@ def create_correlation_heatmap(data):
     
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_forecast_chart(data, target_column, forecast_days=30):
     """Create simple forecast chart using linear trend"""
     if data.empty or 'date' not in data.columns or target_column not in data.columns:
-        fig = go.Figure()
-        fig.add_annotation(text="Insufficient data for forecasting", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("Insufficient data for forecasting")
         return fig
     
     # Prepare data
-    data['date'] = pd.to_datetime(data['date'])
-    daily_data = data.groupby('date')[target_column].sum().reset_index()
-    daily_data = daily_data.sort_values('date')
+    daily_data = daily_aggregates(data)
     
     # Fit simple linear trend
     x = np.arange(len(daily_data))
     y = daily_data[target_column].values
     
     if len(daily_data) < 2:
-        fig = go.Figure()
-        fig.add_annotation(text="Need more data points for forecasting", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("Need more data points for forecasting")
         return fig
     
     # Calculate trend
-    coeffs = np.polyfit(x, y, 1)
-    trend_line = np.poly1d(coeffs)
+    slope, intercept = linear_trend(y)
     
     # Generate forecast
     future_x = np.arange(len(daily_data), len(daily_data) + forecast_days)
     last_date = daily_data['date'].max()
     future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=forecast_days, freq='D')
     
-    forecast_values = trend_line(future_x)
-    
-    # Create chart
-    fig = go.Figure()
-    
-    # Historical data
-    fig.add_trace(go.Scatter(
-        x=daily_data['date'],
-        y=daily_data[target_column],
-        mode='lines+markers',
-        name='Historical',
-        line=dict(color='#28A745')
-    ))
-    
-    # Trend line
-    fig.add_trace(go.Scatter(
-        x=daily_data['date'],
-        y=trend_line(x),
-        mode='lines',
-        name='Trend',
-        line=dict(color='#FFC107', dash='dash')
-    ))
-    
-    # Forecast
-    fig.add_trace(go.Scatter(
-        x=future_dates,
-        y=forecast_values,
-        mode='lines+markers',
-        name='Forecast',
-        line=dict(color='#DC3545', dash='dot')
-    ))
-    
-    fig.update_layout(
-        title=f'{target_column} Forecast ({forecast_days} days)',
-        xaxis_title='Date',
-        yaxis_title=target_column,
-        height=400,
-        hovermode='x'
+    forecast_values = slope * future_x + intercept
+    
+    # Create chart - historical data, trend line and forecast in one constructor call
+    scatter = _scatter_type(len(daily_data))
+    fig = go.Figure(
+        data=[
+            scatter(
+                x=daily_data['date'],
+                y=daily_data[target_column],
+                mode='lines+markers',
+                name='Historical',
+                line=dict(color='#28A745')
+            ),
+            scatter(
+                x=daily_data['date'],
+                y=slope * x + intercept,
+                mode='lines',
+                name='Trend',
+                line=dict(color='#FFC107', dash='dash')
+            ),
+            go.Scatter(
+                x=future_dates,
+                y=forecast_values,
+                mode='lines+markers',
+                name='Forecast',
+                line=dict(color='#DC3545', dash='dot')
+            ),
+        ],
+        layout=dict(
+            title=f'{target_column} Forecast ({forecast_days} days)',
+            xaxis=dict(title='Date'),
+            yaxis=dict(title=target_column),
+            height=400,
+            hovermode='x',
+            uirevision=target_column
+        )
     )
     
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_kpi_gauge(value, title, max_value=None, target=None):
     """Create a KPI gauge chart"""
     if max_value is None:
@@ -231,47 +275,49 @@ def create_kpi_gauge(value, title, max_value=None, target=None):
     fig.update_layout(height=300)
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_comparison_chart(data, x_col, y_col, group_col=None):
     """Create comparison chart (bar or grouped bar)"""
     if data.empty or x_col not in data.columns or y_col not in data.columns:
-        fig = go.Figure()
-        fig.add_annotation(text="Insufficient data for comparison", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("Insufficient data for comparison")
         return fig
     
+    import plotly.express as px
+    
     if group_col and group_col in data.columns:
         # Grouped bar chart
         fig = px.bar(data, x=x_col, y=y_col, color=group_col,
                     title=f'{y_col} by {x_col} (grouped by {group_col})')
     else:
         # Simple bar chart
-        agg_data = data.groupby(x_col)[y_col].sum().reset_index()
+        agg_data = data.groupby(x_col, observed=True)[y_col].sum().reset_index()
         fig = px.bar(agg_data, x=x_col, y=y_col,
                     title=f'{y_col} by {x_col}')
     
     fig.update_layout(height=400)
     return fig
 
+@st.cache_data(show_spinner=False)
 def create_time_series_decomposition(data, value_col):
     """Create time series decomposition chart"""
     if data.empty or 'date' not in data.columns or value_col not in data.columns:
-        fig = go.Figure()
-        fig.add_annotation(text="Insufficient data for time series analysis", x=0.5, y=0.5, showarrow=False)
+        fig = _message_figure("Insufficient data for time series analysis")
         return fig
     
     # Prepare daily data
-    daily_data = data.groupby('date')[value_col].sum().reset_index()
-    daily_data['date'] = pd.to_datetime(daily_data['date'])
-    daily_data = daily_data.sort_values('date').set_index('date')
+    daily_data = daily_aggregates(data).set_index('date')
     
     # Create subplots
+    from plotly.subplots import make_subplots
     fig = make_subplots(
         rows=3, cols=1,
         subplot_titles=['Original', 'Trend (30-day MA)', 'Residual'],
         vertical_spacing=0.08
     )
+    scatter = _scatter_type(len(daily_data))
     
     # Original data
-    fig.add_trace(go.Scatter(
+    fig.add_trace(scatter(
         x=daily_data.index,
         y=daily_data[value_col],
         mode='lines',
@@ -280,8 +326,9 @@ def create_time_series_decomposition(data, value_col):
     ), row=1, col=1)
     
     # Trend (30-day moving average)
-    trend = daily_data[value_col].rolling(window=30, center=True).mean()
-    fig.add_trace(go.Scatter(
+    values = daily_data[value_col].to_numpy(dtype=float)
+    trend = _centered_moving_average(values, 30)
+    fig.add_trace(scatter(
         x=daily_data.index,
         y=trend,
         mode='lines',
@@ -290,8 +337,8 @@ def create_time_series_decomposition(data, value_col):
     ), row=2, col=1)
     
     # Residual
-    residual = daily_data[value_col] - trend
-    fig.add_trace(go.Scatter(
+    residual = values - trend
+    fig.add_trace(scatter(
         x=daily_data.index,
         y=residual,
         mode='lines',
@@ -299,5 +346,5 @@ def create_time_series_decomposition(data, value_col):
         line=dict(color='#DC3545')
     ), row=3, col=1)
     
-    fig.update_layout(height=600, title_text="Time Series Decomposition")
+    fig.update_layout(height=600, title_text="Time Series Decomposition", uirevision=value_col)
     return fig
@@ -0,0 +1,22 @@
+import html
+import streamlit as st
+
+KPI_GRID_STYLE = """
+<style>
+.kpi-grid {display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 1rem;}
+.kpi-grid .kpi {display: flex; flex-direction: column;}
+.kpi-grid .lbl {font-size: 0.875rem; opacity: 0.8;}
+.kpi-grid .val {font-size: 2.25rem; line-height: 1.3;}
+.kpi-grid .delta {font-size: 0.875rem; color: #28A745;}
+</style>
+"""
+
+def render_kpi_grid(cards):
+    """Render (label, value, delta) KPI cards as a single HTML element"""
+    items = "".join(
+        f"<div class='kpi'><span class='lbl'>{html.escape(str(label))}</span>"
+        f"<span class='val'>{html.escape(str(value))}</span>"
+        f"<span class='delta'>{html.escape(str(delta))}</span></div>"
+        for label, value, delta in cards
+    )
+    st.html(f"{KPI_GRID_STYLE}<div class='kpi-grid'>{items}</div>")
@@ -5,21 +5,87 @@ import io
 import openpyxl
 import streamlit as st
 
+# Columns whose name contains one of these hints are parsed as dates on load
+DATE_COLUMN_HINTS = ('date', 'time')
+
+# Low-cardinality text columns stored as categoricals (int codes instead of Python strings)
+CATEGORY_CANDIDATES = ('product', 'category', 'customer')
+# Maximum unique/row ratio for a candidate column to be converted
+CATEGORY_MAX_RATIO = 0.1
+
+# Text columns are probed on this many values before being parsed in full (numbers and dates)
+NUMERIC_SAMPLE_SIZE = 20
+# Share of non-null values that must parse for a text column to count as numeric
+NUMERIC_TEXT_THRESHOLD = 0.95
+# Share of sampled values that must parse for a hinted text column to be read as dates on upload
+DATE_TEXT_THRESHOLD = 0.8
+
+def ensure_datetime(series):
+    """Return the series as datetime64, parsing only when it is not typed yet"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors='coerce', format='mixed')
+
+def linear_trend(y):
+    """Closed-form least-squares slope and intercept of y against 0..n-1"""
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+    x = np.arange(n)
+    sum_x = n * (n - 1) / 2
+    sum_xx = (n - 1) * n * (2 * n - 1) / 6
+    slope = (n * (x @ y) - sum_x * y.sum()) / (n * sum_xx - sum_x * sum_x)
+    intercept = (y.sum() - slope * sum_x) / n
+    return slope, intercept
+
+def _looks_like_dates(series):
+    """True when most of a text column's leading values parse as dates"""
+    if not pd.api.types.is_string_dtype(series):
+        return False
+    sample = series.dropna().head(NUMERIC_SAMPLE_SIZE)
+    return not sample.empty and pd.to_datetime(sample, errors='coerce', format='mixed').notna().mean() >= DATE_TEXT_THRESHOLD
+
+def _parse_date_columns(df, probe=True):
+    """Parse date-like columns once, so downstream code can skip reparsing
+
+    With probe, a hinted column is only converted when its values look like dates;
+    without it every hinted column is coerced (unparseable values become NaT).
+    """
+    parsed = {
+        col: ensure_datetime(df[col])
+        for col in df.columns
+        if any(hint in str(col).lower() for hint in DATE_COLUMN_HINTS)
+        and not pd.api.types.is_datetime64_any_dtype(df[col])
+        and (not probe or _looks_like_dates(df[col]))
+    }
+    return df.assign(**parsed) if parsed else df
+
+def _categorize_columns(df):
+    """Store low-cardinality candidate columns as categoricals"""
+    for col in CATEGORY_CANDIDATES:
+        if col in df.columns and len(df) and df[col].nunique() / len(df) < CATEGORY_MAX_RATIO:
+            df[col] = df[col].astype('category')
+    return df
+
 def process_uploaded_file(uploaded_file):
     """Process uploaded CSV or Excel file"""
     try:
         file_extension = uploaded_file.name.split('.')[-1].lower()
         
         if file_extension == 'csv':
-            # Try different encodings for CSV
+            # Pick the encoding up front so the file is only parsed once
+            raw = uploaded_file.getvalue()
             try:
-                df = pd.read_csv(uploaded_file, encoding='utf-8')
+                raw.decode('utf-8')
+                encoding = 'utf-8'
             except UnicodeDecodeError:
-                uploaded_file.seek(0)  # Reset file pointer
-                df = pd.read_csv(uploaded_file, encoding='latin1')
+                encoding = 'latin1'
+            
+            # Multithreaded Arrow reader; ISO date columns come back already typed
+            df = pd.read_csv(io.BytesIO(raw), encoding=encoding, engine='pyarrow')
         
         elif file_extension in ['xlsx', 'xls']:
-            df = pd.read_excel(uploaded_file, engine='openpyxl')
+            # Rust-based calamine reader (python-calamine), which also handles legacy .xls
+            df = pd.read_excel(uploaded_file, engine='calamine')
         
         else:
             return None
@@ -27,7 +93,7 @@ def process_uploaded_file(uploaded_file):
         # Basic data cleaning
         df.columns = df.columns.str.strip()  # Remove whitespace from column names
         
-        return df
+        return _categorize_columns(_parse_date_columns(df))
         
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
@@ -43,7 +109,7 @@ def validate_data(df):
     }
     
     # Check for missing values
-    missing_count = df.isnull().sum().sum()
+    missing_count = int(df.isna().to_numpy().sum())
     results['missing_values'] = missing_count
     
     if missing_count > 0:
@@ -61,14 +127,14 @@ def validate_data(df):
         results['issues'].append(f"Found {duplicate_count} duplicate rows ({duplicate_percentage:.1f}%)")
     
     # Check for data type consistency
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            # Check if numeric column is stored as text
-            try:
-                pd.to_numeric(df[col], errors='raise')
-                results['issues'].append(f"Column '{col}' appears to be numeric but stored as text")
-            except:
-                pass
+    for col in df.select_dtypes(include='object').columns:
+        # Check if numeric column is stored as text - a cheap sample rules out most text columns
+        values = df[col].dropna()
+        if values.empty or not pd.to_numeric(values.head(NUMERIC_SAMPLE_SIZE), errors='coerce').notna().all():
+            continue
+        
+        if pd.to_numeric(values, errors='coerce').notna().mean() > NUMERIC_TEXT_THRESHOLD:
+            results['issues'].append(f"Column '{col}' appears to be numeric but stored as text")
     
     # Ensure quality score doesn't go below 0
     results['quality_score'] = max(0, results['quality_score'])
@@ -78,7 +144,8 @@ def validate_data(df):
 def clean_data(df, remove_duplicates=True, handle_missing="Keep as is", standardize_dates=True):
     """Clean data based on user preferences"""
     try:
-        cleaned_df = df.copy()
+        # Each step returns a new frame, so the input is never copied up front
+        cleaned_df = df
         
         # Remove duplicates
         if remove_duplicates:
@@ -90,77 +157,69 @@ def clean_data(df, remove_duplicates=True, handle_missing="Keep as is", standard
         elif handle_missing == "Fill with 0":
             cleaned_df = cleaned_df.fillna(0)
         elif handle_missing == "Fill with mean":
-            numeric_columns = cleaned_df.select_dtypes(include=[np.number]).columns
-            for col in numeric_columns:
-                cleaned_df[col] = cleaned_df[col].fillna(cleaned_df[col].mean())
+            numeric = cleaned_df.select_dtypes(include=[np.number])
+            cleaned_df = cleaned_df.fillna(numeric.mean())
         
         # Standardize date formats
         if standardize_dates:
-            for col in cleaned_df.columns:
-                if 'date' in col.lower() or 'time' in col.lower():
-                    try:
-                        cleaned_df[col] = pd.to_datetime(cleaned_df[col], errors='coerce')
-                    except:
-                        pass
+            cleaned_df = _parse_date_columns(cleaned_df, probe=False)
         
-        return cleaned_df
+        # Never hand back the caller's own frame
+        return cleaned_df.copy() if cleaned_df is df else cleaned_df
         
     except Exception as e:
         st.error(f"Error cleaning data: {str(e)}")
         return None
 
+@st.cache_data(show_spinner=False)
 def load_sample_data():
     """Load sample business data for demonstration"""
     # Generate sample business data
-    np.random.seed(42)  # For reproducible results
+    rng = np.random.Generator(np.random.PCG64DXSM(42))  # For reproducible results
     
     # Date range for the last 12 months
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
     date_range = pd.date_range(start=start_date, end=end_date, freq='D')
     
-    # Sample data generation
-    data = []
-    products = ['Product A', 'Product B', 'Product C', 'Product D', 'Product E']
-    categories = ['Electronics', 'Clothing', 'Home & Garden', 'Sports', 'Books']
-    customers = [f'Customer_{i:03d}' for i in range(1, 101)]
+    products = np.array(['Product A', 'Product B', 'Product C', 'Product D', 'Product E'])
+    categories = np.array(['Electronics', 'Clothing', 'Home & Garden', 'Sports', 'Books'])
+    customers = np.array([f'Customer_{i:03d}' for i in range(1, 101)])
     
-    for date in date_range:
-        # Generate 1-10 transactions per day
-        num_transactions = np.random.randint(1, 11)
-        
-        for _ in range(num_transactions):
-            product = np.random.choice(products)
-            category = np.random.choice(categories)
-            customer = np.random.choice(customers)
-            
-            # Generate realistic business metrics
-            quantity = np.random.randint(1, 6)
-            base_price = np.random.uniform(10, 100)
-            price = round(base_price, 2)
-            revenue = round(quantity * price, 2)
-            cost = round(revenue * np.random.uniform(0.4, 0.8), 2)
-            profit = round(revenue - cost, 2)
-            
-            # Add some seasonality
-            seasonal_factor = 1 + 0.2 * np.sin(2 * np.pi * date.dayofyear / 365)
-            revenue *= seasonal_factor
-            profit *= seasonal_factor
-            
-            data.append({
-                'date': date,
-                'product': product,
-                'category': category,
-                'customer': customer,
-                'quantity': quantity,
-                'price': price,
-                'revenue': round(revenue, 2),
-                'cost': round(cost, 2),
-                'profit': round(profit, 2)
-            })
-    
-    return pd.DataFrame(data)
+    # Generate 1-10 transactions per day, then draw every column in one go
+    counts = rng.integers(1, 11, size=len(date_range))
+    total = counts.sum()
+    dates = date_range.repeat(counts)
+    
+    # Product, category and customer codes in a single draw
+    codes = rng.integers(0, [len(products), len(categories), len(customers)], size=(total, 3), dtype=np.int32)
+    
+    # Generate realistic business metrics - price and cost ratio share one uniform draw
+    quantity = rng.integers(1, 6, size=total, dtype=np.int32)
+    uniforms = rng.random((total, 2))
+    price = np.round(10 + 90 * uniforms[:, 0], 2)
+    revenue = quantity * price
+    cost = revenue * (0.4 + 0.4 * uniforms[:, 1])
+    
+    # Add some seasonality - applied to revenue and cost alike, then rounded once
+    seasonal_factor = 1 + 0.2 * np.sin(2 * np.pi * dates.dayofyear.to_numpy() / 365)
+    revenue = np.round(revenue * seasonal_factor, 2)
+    cost = np.round(cost * seasonal_factor, 2)
+    profit = np.round(revenue - cost, 2)
+    
+    return pd.DataFrame({
+        'date': dates,
+        'product': pd.Categorical.from_codes(codes[:, 0], products),
+        'category': pd.Categorical.from_codes(codes[:, 1], categories),
+        'customer': pd.Categorical.from_codes(codes[:, 2], customers),
+        'quantity': quantity,
+        'price': price,
+        'revenue': revenue,
+        'cost': cost,
+        'profit': profit
+    })
 
+@st.cache_data(show_spinner=False)
 def get_kpi_metrics(data):
     """Calculate key performance indicators from data"""
     metrics = {}
@@ -194,32 +253,42 @@ def get_kpi_metrics(data):
     
     # Calculate growth rates (compare last 30 days to previous 30 days)
     if 'date' in data.columns:
-        data['date'] = pd.to_datetime(data['date'])
-        latest_date = data['date'].max()
+        dates = ensure_datetime(data['date'])
+        latest_date = dates.max()
         
-        # Current period (last 30 days)
+        # Current period (last 30 days) and previous period (30 days before that)
         current_start = latest_date - timedelta(days=30)
-        current_data = data[data['date'] >= current_start]
-        
-        # Previous period (30 days before that)
         previous_start = current_start - timedelta(days=30)
-        previous_data = data[(data['date'] >= previous_start) & (data['date'] < current_start)]
         
-        if not previous_data.empty and not current_data.empty:
+        # Row selectors only, so no sub-frame copies are built
+        if dates.is_monotonic_increasing and dates.dt.tz is None:
+            # Sorted dates: two binary searches give contiguous slices
+            values = dates.to_numpy()
+            current_pos = int(np.searchsorted(values, current_start.to_datetime64(), side='left'))
+            previous_pos = int(np.searchsorted(values, previous_start.to_datetime64(), side='left'))
+            current_rows = slice(current_pos, None)
+            previous_rows = slice(previous_pos, current_pos)
+            current_orders = len(values) - current_pos
+            previous_orders = current_pos - previous_pos
+        else:
+            current_rows = (dates >= current_start).to_numpy()
+            previous_rows = ((dates >= previous_start) & (dates < current_start)).to_numpy()
+            current_orders = int(current_rows.sum())
+            previous_orders = int(previous_rows.sum())
+        
+        if previous_orders and current_orders:
             # Revenue growth
-            current_revenue = current_data['revenue'].sum() if 'revenue' in current_data.columns else 0
-            previous_revenue = previous_data['revenue'].sum() if 'revenue' in previous_data.columns else 0
+            current_revenue = data['revenue'].iloc[current_rows].sum() if 'revenue' in data.columns else 0
+            previous_revenue = data['revenue'].iloc[previous_rows].sum() if 'revenue' in data.columns else 0
             metrics['revenue_growth'] = ((current_revenue - previous_revenue) / previous_revenue * 100) if previous_revenue > 0 else 0
             
             # Order growth
-            current_orders = len(current_data)
-            previous_orders = len(previous_data)
             metrics['order_growth'] = ((current_orders - previous_orders) / previous_orders * 100) if previous_orders > 0 else 0
             
             # Customer growth
             if 'customer' in data.columns:
-                current_customers = current_data['customer'].nunique()
-                previous_customers = previous_data['customer'].nunique()
+                current_customers = data['customer'].iloc[current_rows].nunique()
+                previous_customers = data['customer'].iloc[previous_rows].nunique()
                 metrics['customer_growth'] = ((current_customers - previous_customers) / previous_customers * 100) if previous_customers > 0 else 0
             else:
                 metrics['customer_growth'] = 0
@@ -246,8 +315,17 @@ def filter_data_by_date(data, start_date, end_date):
     if 'date' not in data.columns:
         return data
     
-    data['date'] = pd.to_datetime(data['date'])
-    return data[(data['date'] >= pd.to_datetime(start_date)) & (data['date'] <= pd.to_datetime(end_date))]
+    dates = ensure_datetime(data['date'])
+    start, end = pd.to_datetime(start_date), pd.to_datetime(end_date)
+    
+    # Sorted dates can be sliced with a binary search instead of a full mask
+    if dates.is_monotonic_increasing and dates.dt.tz is None:
+        values = dates.to_numpy()
+        lo = np.searchsorted(values, start.to_datetime64(), side='left')
+        hi = np.searchsorted(values, end.to_datetime64(), side='right')
+        return data.iloc[lo:hi]
+    
+    return data[(dates >= start) & (dates <= end)]
 
 def get_analytics_insights(data):
     """Generate analytical insights from data"""
@@ -262,8 +340,9 @@ def get_analytics_insights(data):
     
     # Revenue insights
     if 'revenue' in data.columns:
-        total_revenue = data['revenue'].sum()
-        avg_revenue = data['revenue'].mean()
+        revenue = data['revenue'].to_numpy(dtype=float)
+        total_revenue = np.nansum(revenue)
+        avg_revenue = np.nanmean(revenue)
         insights['performance_metrics']['total_revenue'] = f"${total_revenue:,.2f}"
         insights['performance_metrics']['average_transaction'] = f"${avg_revenue:.2f}"
         
@@ -272,9 +351,8 @@ def get_analytics_insights(data):
         
         # Revenue trend
         if 'date' in data.columns:
-            data['date'] = pd.to_datetime(data['date'])
-            recent_data = data.tail(30)['revenue'].sum()
-            earlier_data = data.head(30)['revenue'].sum()
+            recent_data = np.nansum(revenue[-30:])
+            earlier_data = np.nansum(revenue[:30])
             
             if recent_data > earlier_data:
                 insights['key_insights'].append("Revenue trending upward over time")
@@ -291,7 +369,7 @@ def get_analytics_insights(data):
     
     # Product insights
     if 'product' in data.columns:
-        top_product = data['product'].value_counts().index[0]
+        top_product = data['product'].value_counts().idxmax()
         insights['key_insights'].append(f"Top selling product: {top_product}")
     
     return insights
@@ -301,11 +379,8 @@ def calculate_trends(data, metric_column):
     if 'date' not in data.columns or metric_column not in data.columns:
         return data
     
-    # Ensure date column is datetime
-    data['date'] = pd.to_datetime(data['date'])
-    
-    # Group by date and calculate daily aggregates
-    daily_data = data.groupby('date')[metric_column].sum().reset_index()
+    # Group by (already typed) date and calculate daily aggregates
+    daily_data = data.groupby(ensure_datetime(data['date']))[metric_column].sum().reset_index()
     
     # Calculate rolling averages and trends
     daily_data['rolling_7'] = daily_data[metric_column].rolling(window=7, min_periods=1).mean()
@@ -313,9 +388,7 @@ def calculate_trends(data, metric_column):
     
     # Calculate trend slope (simple linear regression)
     if len(daily_data) > 1:
-        x = np.arange(len(daily_data))
-        y = daily_data[metric_column].values
-        trend_slope = np.polyfit(x, y, 1)[0]
+        trend_slope, _ = linear_trend(daily_data[metric_column].to_numpy())
         daily_data['trend_slope'] = trend_slope
     
     return daily_data
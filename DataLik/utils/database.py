@@ -1,26 +1,82 @@
+import csv
+import io
+import logging
 import os
+import weakref
+from contextlib import contextmanager
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine, text, MetaData, Table, Column, Integer, String, Float, DateTime, Boolean, Text
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
-import json
+import psycopg2.errors
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
 
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
 if not DATABASE_URL:
-    st.error("Database URL not found. Please ensure PostgreSQL is configured.")
-    st.stop()
+    logger.error("DATABASE_URL is not set")
+    raise RuntimeError("Database URL not found. Please ensure PostgreSQL is configured.")
+
+# Connection pool sizing (shared by all Streamlit sessions in this process)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+def get_sql_connection():
+    """Streamlit SQL connection backed by the shared, pooled engine
+
+    st.connection caches the connection as a resource, so the engine and
+    its pool are created once per server process.
+    """
+    return st.connection(
+        "datalik",
+        type="sql",
+        url=DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        pool_use_lifo=True
+    )
+
+def get_engine():
+    """Pooled SQLAlchemy engine shared with the Streamlit SQL connection"""
+    return get_sql_connection().engine
+
+# Dashboard business metrics in a single round-trip
+BUSINESS_METRICS_QUERY = """
+SELECT
+    (SELECT COUNT(*) FROM customers WHERE status = 'Active') AS active_customers,
+    (SELECT COALESCE(SUM(amount), 0)::float FROM invoices WHERE status = 'Paid') AS total_revenue,
+    (SELECT COUNT(*) FROM inventory WHERE current_stock <= reorder_point) AS low_stock_items,
+    (SELECT COUNT(*) FROM employees WHERE status = 'Active') AS total_employees,
+    (SELECT COUNT(*) FROM projects WHERE status IN ('Planning', 'In Progress')) AS active_projects
+"""
+
+# Partial indexes matching the BUSINESS_METRICS_QUERY predicates (only matching rows are stored)
+BUSINESS_METRICS_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_customers_active ON customers (status) WHERE status = 'Active';
+CREATE INDEX IF NOT EXISTS idx_invoices_paid ON invoices (status) INCLUDE (amount) WHERE status = 'Paid';
+CREATE INDEX IF NOT EXISTS idx_inventory_low_stock ON inventory (id) WHERE current_stock <= reorder_point;
+CREATE INDEX IF NOT EXISTS idx_employees_active ON employees (status) WHERE status = 'Active';
+CREATE INDEX IF NOT EXISTS idx_projects_open ON projects (status) WHERE status IN ('Planning', 'In Progress');
+"""
 
 # Create engine and session
 try:
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine()
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base = declarative_base()
-except Exception as e:
-    st.error(f"Failed to connect to database: {e}")
-    st.stop()
+except Exception:
+    logger.exception("Failed to connect to database")
+    raise
+
+def quote_identifier(name):
+    """Quote a table or column name for use in SQL text"""
+    return engine.dialect.identifier_preparer.quote_identifier(name)
 
 class DatabaseManager:
     """Database operations manager for DataLink platform"""
@@ -28,35 +84,42 @@ class DatabaseManager:
     def __init__(self):
         self.engine = engine
         self.session = SessionLocal()
+        # Safety net: a manager used without `with` still returns its connection when collected
+        self._close_session = weakref.finalize(self, self.session.close)
         
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
+        self._close_session()
     
     def initialize_database(self):
         """Initialize all database tables"""
         try:
-            # Create all tables
-            self.create_users_table()
-            self.create_finance_tables()
-            self.create_sales_tables()
-            self.create_logistics_tables()
-            self.create_hr_tables()
-            self.create_projects_table()
-            self.create_audit_log_table()
+            # Create all tables - one multi-statement batch, one round-trip, one transaction
+            schema_ddl = "".join(
+                self.users_table_ddl()
+                + self.finance_tables_ddl()
+                + self.sales_tables_ddl()
+                + self.logistics_tables_ddl()
+                + self.hr_tables_ddl()
+                + self.projects_table_ddl()
+                + self.audit_log_table_ddl()
+                + [BUSINESS_METRICS_INDEXES]
+            )
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql(schema_ddl)
             
             # Insert sample data if tables are empty
             self.insert_sample_data()
             
             return True
-        except Exception as e:
-            st.error(f"Database initialization failed: {e}")
-            return False
+        except Exception:
+            logger.exception("Database initialization failed")
+            raise
     
-    def create_users_table(self):
-        """Create users table for authentication"""
+    def users_table_ddl(self):
+        """CREATE statement for the users table used by authentication"""
         query = """
         CREATE TABLE IF NOT EXISTS users (
             id SERIAL PRIMARY KEY,
@@ -70,11 +133,10 @@ class DatabaseManager:
             last_login TIMESTAMP
         );
         """
-        self.session.execute(text(query))
-        self.session.commit()
+        return [query]
     
-    def create_finance_tables(self):
-        """Create finance-related tables"""
+    def finance_tables_ddl(self):
+        """CREATE statements for the finance-related tables"""
         
         # Chart of Accounts
         accounts_query = """
@@ -140,12 +202,10 @@ class DatabaseManager:
         );
         """
         
-        for query in [accounts_query, invoices_query, expenses_query, transactions_query]:
-            self.session.execute(text(query))
-        self.session.commit()
+        return [accounts_query, invoices_query, expenses_query, transactions_query]
     
-    def create_sales_tables(self):
-        """Create sales-related tables"""
+    def sales_tables_ddl(self):
+        """CREATE statements for the sales-related tables"""
         
         # Customers
         customers_query = """
@@ -217,12 +277,10 @@ class DatabaseManager:
         );
         """
         
-        for query in [customers_query, leads_query, deals_query, activities_query]:
-            self.session.execute(text(query))
-        self.session.commit()
+        return [customers_query, leads_query, deals_query, activities_query]
     
-    def create_logistics_tables(self):
-        """Create logistics-related tables"""
+    def logistics_tables_ddl(self):
+        """CREATE statements for the logistics-related tables"""
         
         # Inventory
         inventory_query = """
@@ -276,12 +334,10 @@ class DatabaseManager:
         );
         """
         
-        for query in [inventory_query, purchase_orders_query, work_orders_query]:
-            self.session.execute(text(query))
-        self.session.commit()
+        return [inventory_query, purchase_orders_query, work_orders_query]
     
-    def create_hr_tables(self):
-        """Create HR-related tables"""
+    def hr_tables_ddl(self):
+        """CREATE statements for the HR-related tables"""
         
         # Employees
         employees_query = """
@@ -338,12 +394,10 @@ class DatabaseManager:
         );
         """
         
-        for query in [employees_query, job_postings_query, leave_requests_query]:
-            self.session.execute(text(query))
-        self.session.commit()
+        return [employees_query, job_postings_query, leave_requests_query]
     
-    def create_projects_table(self):
-        """Create project management table"""
+    def projects_table_ddl(self):
+        """CREATE statement for the project management table"""
         projects_query = """
         CREATE TABLE IF NOT EXISTS projects (
             id SERIAL PRIMARY KEY,
@@ -362,11 +416,10 @@ class DatabaseManager:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         """
-        self.session.execute(text(projects_query))
-        self.session.commit()
+        return [projects_query]
     
-    def create_audit_log_table(self):
-        """Create audit log for tracking changes"""
+    def audit_log_table_ddl(self):
+        """CREATE statement for the audit log that tracks changes"""
         audit_query = """
         CREATE TABLE IF NOT EXISTS audit_log (
             id SERIAL PRIMARY KEY,
@@ -379,15 +432,13 @@ class DatabaseManager:
             changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         """
-        self.session.execute(text(audit_query))
-        self.session.commit()
+        return [audit_query]
     
     def insert_sample_data(self):
         """Insert sample data if tables are empty"""
         try:
-            # Check if data already exists
-            result = self.session.execute(text("SELECT COUNT(*) FROM customers"))
-            if result.scalar() > 0:
+            # Check if data already exists - stops at the first row instead of counting them all
+            if self.session.execute(text("SELECT 1 FROM customers LIMIT 1")).first():
                 return  # Data already exists
             
             # Insert sample customers
@@ -397,13 +448,7 @@ class DatabaseManager:
                 ("CUST-0003", "Mike Davis", "mike@healthsolutions.com", "+234-803-345-6789", "Health Solutions", "Healthcare", "Prospect", "Cold Call", 0.00, "Interested in Q2 implementation"),
             ]
             
-            for customer in customers_data:
-                query = """
-                INSERT INTO customers (customer_id, name, email, phone, company, industry, status, source, total_value, notes)
-                VALUES (:p1, :p2, :p3, :p4, :p5, :p6, :p7, :p8, :p9, :p10)
-                """
-                params = {f'p{i+1}': customer[i] for i in range(len(customer))}
-                self.session.execute(text(query), params)
+            self.insert_rows('customers', ('customer_id', 'name', 'email', 'phone', 'company', 'industry', 'status', 'source', 'total_value', 'notes'), customers_data)
             
             # Insert sample chart of accounts
             accounts_data = [
@@ -417,13 +462,7 @@ class DatabaseManager:
                 ("5100", "Office Expenses", "Expenses", 3200.00),
             ]
             
-            for account in accounts_data:
-                query = """
-                INSERT INTO chart_of_accounts (account_code, account_name, account_type, balance)
-                VALUES (:p1, :p2, :p3, :p4)
-                """
-                params = {f'p{i+1}': account[i] for i in range(len(account))}
-                self.session.execute(text(query), params)
+            self.insert_rows('chart_of_accounts', ('account_code', 'account_name', 'account_type', 'balance'), accounts_data)
             
             # Insert sample inventory
             inventory_data = [
@@ -432,13 +471,7 @@ class DatabaseManager:
                 ("PRT-003", "Printer HP LaserJet", "Electronics", 45, 20, 300.00, 450.00, "HP Supplier", "Warehouse A"),
             ]
             
-            for item in inventory_data:
-                query = """
-                INSERT INTO inventory (sku, product_name, category, current_stock, reorder_point, unit_cost, unit_price, supplier, location)
-                VALUES (:p1, :p2, :p3, :p4, :p5, :p6, :p7, :p8, :p9)
-                """
-                params = {f'p{i+1}': item[i] for i in range(len(item))}
-                self.session.execute(text(query), params)
+            self.insert_rows('inventory', ('sku', 'product_name', 'category', 'current_stock', 'reorder_point', 'unit_cost', 'unit_price', 'supplier', 'location'), inventory_data)
             
             # Insert sample employees
             employees_data = [
@@ -447,13 +480,7 @@ class DatabaseManager:
                 ("EMP-003", "Mike", "Davis", "mike.davis@company.com", "+234-803-333-3333", "Marketing", "Marketing Specialist", "2023-06-10", 55000.00, "Active"),
             ]
             
-            for employee in employees_data:
-                query = """
-                INSERT INTO employees (employee_id, first_name, last_name, email, phone, department, position, hire_date, salary, status)
-                VALUES (:p1, :p2, :p3, :p4, :p5, :p6, :p7, :p8, :p9, :p10)
-                """
-                params = {f'p{i+1}': employee[i] for i in range(len(employee))}
-                self.session.execute(text(query), params)
+            self.insert_rows('employees', ('employee_id', 'first_name', 'last_name', 'email', 'phone', 'department', 'position', 'hire_date', 'salary', 'status'), employees_data)
             
             # Insert sample projects
             projects_data = [
@@ -462,38 +489,163 @@ class DatabaseManager:
                 ("Database Migration", "Migrate legacy database to PostgreSQL", "2023-12-01", "2024-01-20", "Completed", 100, 8000.00, 3, "Project Manager 1", "Internal"),
             ]
             
-            for project in projects_data:
-                query = """
-                INSERT INTO projects (project_name, description, start_date, due_date, status, progress, budget, team_size, project_manager, client)
-                VALUES (:p1, :p2, :p3, :p4, :p5, :p6, :p7, :p8, :p9, :p10)
-                """
-                params = {f'p{i+1}': project[i] for i in range(len(project))}
-                self.session.execute(text(query), params)
+            self.insert_rows('projects', ('project_name', 'description', 'start_date', 'due_date', 'status', 'progress', 'budget', 'team_size', 'project_manager', 'client'), projects_data)
             
             self.session.commit()
-            print("Sample data inserted successfully")
+            logger.info("Sample data inserted successfully")
             
-        except Exception as e:
+        except Exception:
             self.session.rollback()
-            print(f"Error inserting sample data: {e}")
+            logger.exception("Error inserting sample data")
+            raise
     
-    def get_table_data(self, table_name, limit=None):
-        """Get data from any table"""
+    def insert_rows(self, table_name, columns, rows, page_size=500):
+        """Insert many rows with batched multi-row INSERTs inside the session's transaction"""
+        column_list = ', '.join(quote_identifier(column) for column in columns)
+        cursor = self.session.connection().connection.cursor()
         try:
-            query = f"SELECT * FROM {table_name}"
-            if limit:
-                query += f" LIMIT {limit}"
-            
-            result = self.session.execute(text(query))
+            execute_values(
+                cursor,
+                f"INSERT INTO {quote_identifier(table_name)} ({column_list}) VALUES %s",
+                rows,
+                page_size=page_size
+            )
+        finally:
+            cursor.close()
+    
+    def get_table_data(self, table_name, limit=None, offset=None, chunksize=None):
+        """Get data from any table
+
+        With chunksize, rows are streamed through a server-side cursor and an
+        iterator of DataFrames is returned instead of a single DataFrame.
+        """
+        query = f"SELECT * FROM {quote_identifier(table_name)}"
+        params = {}
+        if limit:
+            query += " LIMIT :limit"
+            params['limit'] = limit
+        if offset:
+            query += " OFFSET :offset"
+            params['offset'] = offset
+        
+        if chunksize:
+            return self._iter_table_chunks(table_name, text(query), params, chunksize)
+        
+        try:
+            result = self.session.execute(text(query), params)
             columns = result.keys()
             data = result.fetchall()
             
             # Convert to DataFrame
             df = pd.DataFrame(data, columns=columns)
             return df
-        except Exception as e:
-            st.error(f"Error fetching data from {table_name}: {e}")
-            return pd.DataFrame()
+        except Exception:
+            logger.exception("Error fetching data from %s", table_name)
+            raise
+    
+    def _iter_table_chunks(self, table_name, query, params, chunksize):
+        """Yield DataFrames of up to chunksize rows from a server-side cursor"""
+        try:
+            # yield_per makes psycopg2 use a named cursor with itersize=chunksize
+            result = self.session.execute(query, params, execution_options={'yield_per': chunksize})
+            columns = result.keys()
+            for rows in result.partitions():
+                yield pd.DataFrame(rows, columns=columns)
+        except Exception:
+            logger.exception("Error fetching data from %s", table_name)
+            raise
+    
+    def get_table_page(self, table_name, pk_column, last_seen_pk=None, limit=25):
+        """Get one page of rows ordered by primary key (keyset pagination)"""
+        try:
+            pk = quote_identifier(pk_column)
+            query = f"SELECT * FROM {quote_identifier(table_name)}"
+            params = {'limit': limit}
+            if last_seen_pk is not None:
+                query += f" WHERE {pk} > :last_seen_pk"
+                params['last_seen_pk'] = last_seen_pk
+            query += f" ORDER BY {pk} LIMIT :limit"
+            
+            result = self.session.execute(text(query), params)
+            return pd.DataFrame(result.fetchall(), columns=result.keys())
+        except Exception:
+            logger.exception("Error fetching data from %s", table_name)
+            raise
+    
+    @contextmanager
+    def raw_cursor(self):
+        """DBAPI cursor on a pooled connection, committed on success and rolled back on error"""
+        raw_connection = self.engine.raw_connection()
+        try:
+            with raw_connection.cursor() as cursor:
+                yield cursor
+            raw_connection.commit()
+        except Exception:
+            raw_connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+    
+    def export_table_csv(self, table_name):
+        """Dump a whole table as CSV bytes with a single COPY ... TO STDOUT"""
+        with io.BytesIO() as buffer:
+            with self.raw_cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {quote_identifier(table_name)} TO STDOUT WITH (FORMAT csv, HEADER)",
+                    buffer
+                )
+            return buffer.getvalue()
+    
+    @staticmethod
+    def _clear_table(cursor, table_name):
+        """Empty a table with TRUNCATE, falling back to DELETE when other tables reference it"""
+        table = quote_identifier(table_name)
+        cursor.execute("SAVEPOINT clear_table")
+        try:
+            cursor.execute(f"TRUNCATE {table}")
+        except psycopg2.errors.FeatureNotSupported:
+            # TRUNCATE refuses foreign-key targets; DELETE checks the references row by row
+            cursor.execute("ROLLBACK TO SAVEPOINT clear_table")
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute("RELEASE SAVEPOINT clear_table")
+    
+    @staticmethod
+    def _sync_id_sequence(cursor, table_name, columns):
+        """Move a serial id sequence past the restored ids so new inserts don't collide"""
+        if 'id' in columns:
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) "
+                f"FROM {quote_identifier(table_name)}",
+                (quote_identifier(table_name),)
+            )
+    
+    def restore_table_csv(self, table_name, csv_file):
+        """Replace all rows of a table from a CSV file (with header) using COPY FROM STDIN"""
+        columns = next(csv.reader([csv_file.readline()]))
+        table = quote_identifier(table_name)
+        column_list = ', '.join(quote_identifier(column) for column in columns)
+        
+        with self.raw_cursor() as cursor:
+            self._clear_table(cursor, table_name)
+            cursor.copy_expert(f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)", csv_file)
+            self._sync_id_sequence(cursor, table_name, columns)
+    
+    def restore_table_records(self, table_name, records, page_size=1000):
+        """Replace all rows of a table from a list of dicts using batched inserts"""
+        table = quote_identifier(table_name)
+        
+        with self.raw_cursor() as cursor:
+            self._clear_table(cursor, table_name)
+            if records:
+                columns = list(records[0].keys())
+                column_list = ', '.join(quote_identifier(column) for column in columns)
+                execute_values(
+                    cursor,
+                    f"INSERT INTO {table} ({column_list}) VALUES %s",
+                    [tuple(map(record.get, columns)) for record in records],
+                    page_size=page_size
+                )
+                self._sync_id_sequence(cursor, table_name, columns)
     
     def execute_query(self, query, params=None):
         """Execute custom query"""
@@ -505,46 +657,31 @@ class DatabaseManager:
             
             self.session.commit()
             return result
-        except Exception as e:
+        except Exception:
             self.session.rollback()
-            st.error(f"Query execution error: {e}")
-            return None
-    
-    def get_business_metrics(self):
-        """Get key business metrics from database"""
-        metrics = {}
-        
-        try:
-            # Customer metrics
-            result = self.session.execute(text("SELECT COUNT(*) FROM customers WHERE status = 'Active'"))
-            metrics['active_customers'] = result.scalar() or 0
-            
-            # Revenue metrics
-            result = self.session.execute(text("SELECT SUM(amount) FROM invoices WHERE status = 'Paid'"))
-            metrics['total_revenue'] = float(result.scalar() or 0)
-            
-            # Inventory metrics
-            result = self.session.execute(text("SELECT COUNT(*) FROM inventory WHERE current_stock <= reorder_point"))
-            metrics['low_stock_items'] = result.scalar() or 0
-            
-            # Employee metrics
-            result = self.session.execute(text("SELECT COUNT(*) FROM employees WHERE status = 'Active'"))
-            metrics['total_employees'] = result.scalar() or 0
-            
-            # Project metrics
-            result = self.session.execute(text("SELECT COUNT(*) FROM projects WHERE status IN ('Planning', 'In Progress')"))
-            metrics['active_projects'] = result.scalar() or 0
-            
-            return metrics
-        except Exception as e:
-            st.error(f"Error getting business metrics: {e}")
-            return {}
+            logger.exception("Query execution error")
+            raise
 
 def get_database_connection():
-    """Get database connection for use in modules"""
+    """Get database connection for use in modules
+
+    The session checks a connection out of the shared engine pool and
+    returns it when the context manager exits.
+    """
     return DatabaseManager()
 
 def initialize_database():
     """Initialize database tables and sample data"""
     with DatabaseManager() as db:
-        return db.initialize_database()
\ No newline at end of file
+        return db.initialize_database()
+
+def get_cached_business_metrics(ttl=60):
+    """Get business metrics through the SQL connection, cached for ttl seconds"""
+    try:
+        metrics_df = get_sql_connection().query(BUSINESS_METRICS_QUERY, ttl=ttl)
+        metrics = metrics_df.iloc[0].to_dict()
+        metrics['total_revenue'] = float(metrics['total_revenue'])
+        return metrics
+    except Exception:
+        logger.exception("Error getting business metrics")
+        raise
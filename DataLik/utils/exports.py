@@ -126,7 +126,7 @@ def export_dashboard_pdf(data):
     if 'product' in data.columns and 'revenue' in data.columns:
         story.append(Paragraph("Top Performing Products", styles['Heading2']))
         
-        top_products = data.groupby('product')['revenue'].sum().sort_values(ascending=False).head(5)
+        top_products = data.groupby('product', observed=True)['revenue'].sum().sort_values(ascending=False).head(5)
         
         products_data = [['Product', 'Revenue']]
         for product, revenue in top_products.items():
@@ -195,10 +195,10 @@ def export_dashboard_pdf(data):
     
     # Prepare data for table
     table_data = [list(sample_data.columns)]
-    for _, row in sample_data.iterrows():
+    for row in sample_data.itertuples(index=False):
         table_row = []
-        for col in sample_data.columns:
-            value = str(row[col])
+        for cell in row:
+            value = str(cell)
             # Truncate long values
             if len(value) > 20:
                 value = value[:17] + "..."